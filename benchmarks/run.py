@@ -0,0 +1,254 @@
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from fractions import Fraction
+from typing import Any, Callable, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import reals  # noqa: E402
+import reals._pi  # noqa: E402
+import reals._compare  # noqa: E402
+import reals._constants  # noqa: E402
+import reals.approximation  # noqa: E402
+
+# runs the benchmarks in CASES, each measuring the time it takes to compute a number of digits; every measurement runs
+# in a fresh process, so that the cached terms of constants and other caches are never shared between measurements
+#
+#   python benchmarks/run.py --output results.json
+#   python benchmarks/run.py --baseline results.json
+#
+# the results contain the times for every number of digits and the exponent k of the fitted curve time ~ digits^k;
+# compared with a baseline, a case that got slower by more than the threshold, or whose exponent grew by more than
+# MAX_EXPONENT_INCREASE, is flagged as a regression; a case whose exponent exceeds MAX_EXPONENT is flagged as well,
+# with or without a baseline, since every case is expected to scale near-linearly in the number of digits
+#
+# the time of importing reals is measured as well, in a fresh process since this script imports reals itself; it is
+# compared with the baseline like the cases, and flagged when it exceeds MAX_IMPORT_SECONDS, since importing reals
+# loads the submodules on first use and takes far less (importing all of them takes about 0.17 seconds)
+DIGITS = [100, 1000, 10000]
+REPEAT = 3
+MAX_SECONDS = 120.0
+THRESHOLD = 1.5
+MAX_EXPONENT_INCREASE = 0.25
+MAX_EXPONENT = 1.6
+MAX_IMPORT_SECONDS = 0.05
+
+# measurements that take longer than this are not repeated, since their timing noise is small anyway
+LONG_SECONDS = 1.0
+
+FORMAT_VERSION = 1
+
+
+def sqrt2() -> reals.Real:
+    return reals.sqrt(2)
+
+
+def e() -> reals.Real:
+    return reals.Real(reals._constants.e_term_generator())
+
+
+# a rational within 10^-n of pi, which is computed from a separate instance of pi
+def pi_digits(n: int) -> Fraction:
+    approximation = reals.approximation.Approximation(reals.Real(reals._pi.pi_term_generator()))
+    approximation.improve_epsilon(Fraction(1, 10**n))
+    result = approximation.as_fraction()
+    assert result is not None
+    return result
+
+
+# every case takes the number of digits and does its setup, and returns the function that is timed
+CASES: dict[str, Callable[[int], Callable[[], Any]]] = {
+    'pi': lambda n: lambda: reals.pi.evaluate(n),
+    'e': lambda n: lambda: reals.e.evaluate(n),
+    'log2': lambda n: lambda: reals.log2.evaluate(n),
+    'add': lambda n: lambda: (sqrt2() + e()).evaluate(n),
+    'sub': lambda n: lambda: (sqrt2() - e()).evaluate(n),
+    'mul': lambda n: lambda: (sqrt2() * e()).evaluate(n),
+    'div': lambda n: lambda: (sqrt2() / e()).evaluate(n),
+    'exp': lambda n: lambda: reals.exp(Fraction(1, 3)).evaluate(n),
+    'exp_real': lambda n: lambda: reals.exp(sqrt2()).evaluate(n),
+    'log': lambda n: lambda: reals.log(Fraction(10, 3)).evaluate(n),
+    'log_real': lambda n: lambda: reals.log(sqrt2()).evaluate(n),
+    'sqrt': lambda n: lambda: reals.sqrt(Fraction(10, 3)).evaluate(n),
+    'sqrt_real': lambda n: lambda: reals.sqrt(e()).evaluate(n),
+    'sin': lambda n: lambda: reals.sin(1).evaluate(n),
+    'cos': lambda n: lambda: reals.cos(Fraction(1, 3)).evaluate(n),
+    'tan': lambda n: lambda: reals.tan(Fraction(7, 3)).evaluate(n),
+    'sin_real': lambda n: lambda: reals.sin(sqrt2()).evaluate(n),
+    'compare': lambda n: (lambda y: lambda: reals._compare.compare(reals.pi, y, Fraction(1, 10**(n + 2))))(
+        reals.Real.from_fraction(pi_digits(n) + Fraction(1, 10**n))),
+    'to_float': lambda n: (lambda y: lambda: (reals.pi - y).to_float())(pi_digits(n)),
+}
+
+
+def measure(name: str, n: int) -> float:
+    run = CASES[name](n)
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+# the environment of the processes that are measured, which import reals from this repository
+def environment() -> dict[str, str]:
+    return dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, os.environ.get('PYTHONPATH', '')]))
+
+
+# the minimum time of a number of runs in separate processes, or None if a run takes longer than max_seconds
+def benchmark(name: str, n: int, repeat: int, max_seconds: float) -> Optional[float]:
+    times = []
+    for _ in range(0, repeat):
+        try:
+            result = subprocess.run([sys.executable, os.path.abspath(__file__), '--measure', name, str(n)],
+                                    env=environment(), capture_output=True, text=True, check=True,
+                                    timeout=max_seconds)
+        except subprocess.TimeoutExpired:
+            return None
+        times.append(float(result.stdout))
+        if times[-1] > LONG_SECONDS:
+            break
+    return min(times)
+
+
+# the minimum time of importing reals in a number of fresh processes
+def import_seconds(repeat: int) -> float:
+    code = 'import time; start = time.perf_counter(); import reals; print(time.perf_counter() - start)'
+    times = []
+    for _ in range(0, repeat):
+        result = subprocess.run([sys.executable, '-c', code], env=environment(), capture_output=True, text=True,
+                                check=True)
+        times.append(float(result.stdout))
+    return min(times)
+
+
+# the slope of the least squares fit of log(time) against log(digits)
+def exponent(seconds: dict[str, Optional[float]]) -> Optional[float]:
+    points = [(math.log(int(n)), math.log(t)) for n, t in seconds.items() if t is not None and t > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x)**2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def run_cases(names: list[str], digits: list[int], repeat: int, max_seconds: float) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    for name in names:
+        seconds: dict[str, Optional[float]] = {}
+        for n in digits:
+            # once a case exceeds the time limit, it is skipped for larger numbers of digits
+            timed_out = any(t is None for t in seconds.values())
+            seconds[str(n)] = None if timed_out else benchmark(name, n, repeat, max_seconds)
+        results[name] = {'seconds': seconds, 'exponent': exponent(seconds)}
+        print(format_row(name, results[name], digits), flush=True)
+
+    return {'version': FORMAT_VERSION, 'python': platform.python_version(), 'platform': platform.platform(),
+            'digits': digits, 'results': results}
+
+
+def format_row(name: str, result: dict[str, Any], digits: list[int]) -> str:
+    times = ''.join(f'{format_seconds(result["seconds"].get(str(n))):>12}' for n in digits)
+    k = result['exponent']
+    return f'{name:<12}{times}{"-" if k is None else f"{k:.2f}":>10}'
+
+
+def format_seconds(t: Optional[float]) -> str:
+    return 'timeout' if t is None else f'{t:.4f}'
+
+
+# returns a description of every regression with respect to the baseline
+def regressions(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    found = []
+    for name, result in results['results'].items():
+        if name not in baseline['results']:
+            continue
+        old = baseline['results'][name]
+        for n, t in result['seconds'].items():
+            t_old = old['seconds'].get(n)
+            if t_old is not None and (t is None or t > threshold * t_old):
+                found.append(f'{name} at {n} digits: {format_seconds(t_old)}s -> {format_seconds(t)}s')
+        # the exponents are only comparable when they are fitted to the same numbers of digits
+        k, k_old = result['exponent'], exponent({n: old['seconds'].get(n) for n in result['seconds']})
+        if k is not None and k_old is not None and k > k_old + MAX_EXPONENT_INCREASE:
+            found.append(f'{name}: scaling exponent {k_old:.2f} -> {k:.2f}')
+
+    t, t_old = results.get('import_seconds'), baseline.get('import_seconds')
+    if t is not None and t_old is not None and t > threshold * t_old:
+        found.append(f'import: {format_seconds(t_old)}s -> {format_seconds(t)}s')
+    return found
+
+
+# returns a description of every case that scales worse than max_exponent
+def scaling_failures(results: dict[str, Any], max_exponent: float) -> list[str]:
+    return [f'{name}: scaling exponent {result["exponent"]:.2f} > {max_exponent:.2f}'
+            for name, result in results['results'].items()
+            if result['exponent'] is not None and result['exponent'] > max_exponent]
+
+
+# returns a description of the import time if it exceeds max_seconds
+def import_failures(results: dict[str, Any], max_seconds: float) -> list[str]:
+    t = results['import_seconds']
+    return [f'import: {format_seconds(t)}s > {format_seconds(max_seconds)}s'] if t > max_seconds else []
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmarks of reals at increasing numbers of digits.')
+    parser.add_argument('cases', nargs='*', help=f'the cases to run, out of {", ".join(CASES)} (default: all)')
+    parser.add_argument('--digits', type=int, nargs='+', default=DIGITS)
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    parser.add_argument('--max-seconds', type=float, default=MAX_SECONDS)
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--baseline', help='compare the results with the JSON results in this file')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    parser.add_argument('--max-exponent', type=float, default=MAX_EXPONENT)
+    parser.add_argument('--max-import-seconds', type=float, default=MAX_IMPORT_SECONDS)
+    parser.add_argument('--measure', nargs=2, metavar=('CASE', 'DIGITS'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        name, n = args.measure
+        print(measure(name, int(n)))
+        return
+
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f'unknown cases: {", ".join(unknown)}')
+
+    print(f'{"case":<12}' + ''.join(f'{n:>12}' for n in args.digits) + f'{"exponent":>10}')
+    results = run_cases(args.cases or list(CASES), args.digits, args.repeat, args.max_seconds)
+    results['import_seconds'] = import_seconds(args.repeat)
+    print(f'{"import":<12}{format_seconds(results["import_seconds"]):>12}')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    found = scaling_failures(results, args.max_exponent)
+    for failure in found:
+        print(f'scaling: {failure}')
+
+    slow_import = import_failures(results, args.max_import_seconds)
+    for failure in slow_import:
+        print(f'budget: {failure}')
+    found += slow_import
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressed = regressions(results, json.load(f), args.threshold)
+        for regression in regressed:
+            print(f'regression: {regression}')
+        found += regressed
+
+    if found:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
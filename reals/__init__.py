@@ -1,9 +1,38 @@
-from reals._real import Real
-from reals._constants import e, phi, pi, log2
-from reals._exponential import exp
-from reals._logarithm import log
-from reals._sqrt import sqrt
-from reals._trigonometric import sin, sinh, csc, csch, cos, cosh, sec, sech, tan, tanh, cot, coth
+import importlib
+from typing import TYPE_CHECKING
+
+# the public names are imported from their modules when they are first used, so that importing reals is fast
+if TYPE_CHECKING:
+    from reals._real import Real
+    from reals._constants import e, phi, pi, log2
+    from reals._exponential import exp
+    from reals._logarithm import log
+    from reals._sqrt import sqrt
+    from reals._trigonometric import sin, sinh, csc, csch, cos, cosh, sec, sech, tan, tanh, cot, coth
+    from reals._parallel import evaluate_many
+    from reals._budget import Budget, BudgetExceeded
 
 __all__ = ['Real', 'e', 'phi', 'pi', 'exp', 'log', 'sqrt', 'sin', 'sinh', 'csc', 'csch', 'cos', 'cosh', 'sec', 'sech',
-           'tan', 'tanh', 'cot', 'coth', 'log2']
+           'tan', 'tanh', 'cot', 'coth', 'log2', 'evaluate_many', 'Budget', 'BudgetExceeded']
+
+MODULES = {'Real': 'reals._real', 'e': 'reals._constants', 'phi': 'reals._constants', 'pi': 'reals._constants',
+           'log2': 'reals._constants', 'exp': 'reals._exponential', 'log': 'reals._logarithm', 'sqrt': 'reals._sqrt',
+           'evaluate_many': 'reals._parallel', 'Budget': 'reals._budget', 'BudgetExceeded': 'reals._budget'}
+MODULES.update({name: 'reals._trigonometric' for name in __all__ if name not in MODULES})
+
+SUBMODULES = ['approximation', 'precomputed']
+
+
+def __getattr__(name: str):
+    if name in MODULES:
+        value = getattr(importlib.import_module(MODULES[name]), name)
+    elif name in SUBMODULES:
+        value = importlib.import_module(f'reals.{name}')
+    else:
+        raise AttributeError(f"module 'reals' has no attribute '{name}'")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__) | set(SUBMODULES))
@@ -5,6 +5,12 @@ import reals._homographic
 
 DEFAULT_MAX_INGESTIONS = 15
 
+# the number of ingestions and emissions after which the common factor of the coefficients is divided out
+REDUCTION_INTERVAL = 16
+# the gcd takes time quadratic in the size of the coefficients while an update takes linear time, so the interval is
+# also at least the size of the largest coefficient divided by this
+BITS_PER_UPDATE = 32
+
 
 class AlgebraicComputation(reals._computation.Computation):
     def __init__(
@@ -18,6 +24,16 @@ class AlgebraicComputation(reals._computation.Computation):
         self.max_ingestions = max_ingestions
         self.terminated = False
         self.simple_mode = True
+        self.updates = 0
+        self.reduction_interval = REDUCTION_INTERVAL
+        self.next_reduction = REDUCTION_INTERVAL
+        self.max_coefficient_bits = 0
+        # the number of terms ingested, and how often the computation switched to emitting generalized terms
+        self.ingestions = 0
+        self.non_simple_entries = 0
+
+    def coefficient_bits(self) -> int:
+        return self.state.bit_length()
 
     def ingest_x(self) -> None:
         try:
@@ -25,6 +41,14 @@ class AlgebraicComputation(reals._computation.Computation):
         except StopIteration:
             self.terminated = self.state.ingest_inf()
 
+    # computing the gcd of large coefficients is expensive, so every time there turns out to be no common factor, the
+    # next reduction is postponed for twice as long
+    def reduce(self) -> None:
+        bits = self.state.bit_length()
+        reduced_bits = self.state.reduce()
+        self.reduction_interval = REDUCTION_INTERVAL if reduced_bits < bits else 2 * self.reduction_interval
+        self.next_reduction = self.updates + max(self.reduction_interval, reduced_bits // BITS_PER_UPDATE)
+
     def __next__(self) -> reals._term.Term:
         if self.terminated:
             raise StopIteration()
@@ -33,7 +57,13 @@ class AlgebraicComputation(reals._computation.Computation):
 
         ingestions = 0
         while True:
-            self.simple_mode = self.simple_mode and ingestions <= self.max_ingestions
+            self.updates += 1
+            if self.updates == self.next_reduction:
+                self.reduce()
+
+            if self.simple_mode and ingestions > self.max_ingestions:
+                self.simple_mode = False
+                self.non_simple_entries += 1
 
             if (self.state.c != 0 and
                     reals._utils.sign(self.state.c) == reals._utils.sign(self.state.c + self.state.d)):
@@ -53,6 +83,9 @@ class AlgebraicComputation(reals._computation.Computation):
                     return (n, m)
 
             self.ingest_x()
+            self.ingestions += 1
+            # ingesting is the only update that makes the coefficients larger, so this is their maximum size
+            self.max_coefficient_bits = max(self.max_coefficient_bits, self.state.bit_length())
             if self.terminated:
                 raise StopIteration()
 
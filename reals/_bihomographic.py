@@ -1,5 +1,7 @@
 import reals._term
 
+import math
+
 
 class Bihomographic:
     a: int
@@ -45,3 +47,16 @@ class Bihomographic:
         self.a, self.b, self.c, self.d, self.e, self.f, self.g, self.h = \
             m * self.e, m * self.f, m * self.g, m * self.h, self.a, self.b, self.c, self.d
         return terminated
+
+    # divide out the common factor of the coefficients, returns the bit length of the largest coefficient
+    def reduce(self) -> int:
+        g = math.gcd(self.a, self.b, self.c, self.d, self.e, self.f, self.g, self.h)
+        if g > 1:
+            self.a, self.b, self.c, self.d = self.a // g, self.b // g, self.c // g, self.d // g
+            self.e, self.f, self.g, self.h = self.e // g, self.f // g, self.g // g, self.h // g
+        return self.bit_length()
+
+    # the bit length of the largest coefficient
+    def bit_length(self) -> int:
+        return max(self.a.bit_length(), self.b.bit_length(), self.c.bit_length(), self.d.bit_length(),
+                   self.e.bit_length(), self.f.bit_length(), self.g.bit_length(), self.h.bit_length())
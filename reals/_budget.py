@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import reals._real
+import reals._computation
+import reals.approximation
+
+import time
+import threading
+import contextvars
+from fractions import Fraction
+from typing import Any, Iterator, Optional
+
+Interval = tuple[Optional[Fraction], Optional[Fraction]]
+
+
+class BudgetExceeded(Exception):
+    def __init__(self, resource: str, interval: Interval = (None, None)) -> None:
+        super().__init__()
+        self.resource = resource
+        # the best interval that is known to contain the value being computed, where None is an unknown bound; it is
+        # filled in by the function that was called, such as Real.evaluate or compare
+        self.interval = interval
+        # the budget that was exceeded, which is one of the budgets that were active
+        self.budget: Optional[Budget] = None
+
+    def __str__(self) -> str:
+        return f'The budget of {self.resource} was exceeded'
+
+
+# a budget is shared by every real that computes a term while it is active, which counts as an ingestion by the real
+# that needs the term; it is checked before the term is computed, so that an exceeded budget leaves every computation
+# in a state from which it can continue later, for instance with a larger budget
+class Budget:
+    def __init__(self, max_ingestions: Optional[int] = None, max_coefficient_bits: Optional[int] = None,
+                 seconds: Optional[float] = None) -> None:
+        self.max_ingestions = max_ingestions
+        self.max_coefficient_bits = max_coefficient_bits
+        self.seconds = seconds
+        self.ingestions = 0
+        self.deadline: Optional[float] = None
+        # the budget that was active when this one was entered, which is charged as well
+        self.parent: Optional[Budget] = None
+        self.token: Optional[contextvars.Token[Optional[Budget]]] = None
+
+    def charge(self, iterator: Iterator[Any]) -> None:
+        self.ingestions += 1
+        if self.max_ingestions is not None and self.ingestions > self.max_ingestions:
+            raise self.exceeded('ingestions')
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise self.exceeded('time')
+        if self.max_coefficient_bits is not None:
+            # the coefficients of the computation after its last term
+            bits = reals._computation.coefficient_bits(iterator)
+            if bits is not None and bits > self.max_coefficient_bits:
+                raise self.exceeded('coefficient bits')
+
+    def exceeded(self, resource: str) -> BudgetExceeded:
+        exceeded = BudgetExceeded(resource)
+        exceeded.budget = self
+        return exceeded
+
+    # a budget is active in a single context at a time, since it would otherwise lose track of its parent
+    def __enter__(self) -> Budget:
+        global budgets
+        if self.token is not None:
+            raise RuntimeError('The budget is already active')
+        if self.seconds is not None:
+            self.deadline = time.monotonic() + self.seconds
+        self.parent = current.get()
+        self.token = current.set(self)
+        with lock:
+            budgets += 1
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        global budgets
+        assert self.token is not None
+        current.reset(self.token)
+        self.token = None
+        with lock:
+            budgets -= 1
+
+
+current: contextvars.ContextVar[Optional[Budget]] = contextvars.ContextVar('budget', default=None)
+
+# the number of budgets that are active in any context; while it is 0, computing a term costs a single extra check
+budgets = 0
+# held while budgets is updated, which threads with their own budgets do concurrently
+lock = threading.Lock()
+
+
+def charge(computation: reals._real.CachedComputation) -> None:
+    budget = current.get()
+    while budget is not None:
+        budget.charge(computation.iterator)
+        budget = budget.parent
+
+
+# bounds of x from the terms that it has computed, which hold whatever its remaining terms are
+def cached_interval(x: reals._real.Real) -> Interval:
+    terms = list(x.cache)
+    if not terms:
+        return (None, None)
+    a, b, c, d = reals.approximation.term_product(terms, 0, len(terms))
+    if c == 0 or c + d == 0:
+        return (None, None)
+    return (min(Fraction(a, c), Fraction(a + b, c + d)), max(Fraction(a, c), Fraction(a + b, c + d)))
@@ -1,8 +1,11 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
+
+import reals._budget
 
 if TYPE_CHECKING:
     from reals._real import Real
+    from reals.approximation import Approximation
 
 from enum import Enum, auto
 from fractions import Fraction
@@ -10,6 +13,8 @@ from fractions import Fraction
 
 EPSILON = Fraction(1, 100000)
 
+Ratio = tuple[int, int]
+
 
 class ComparisonResult(Enum):
     SMALLER = auto()
@@ -17,40 +22,56 @@ class ComparisonResult(Enum):
     UNKNOWN = auto()
 
 
-# TODO(Ruben): this is very ugly, needs a rewrite
+# refines the shared approximations of x and y until their intervals are disjoint, or until both are narrower than
+# epsilon / 2; the bounds are compared as integer ratios (p, q) with q > 0 to avoid normalizing fractions, and the
+# number of ingested terms is doubled at every step; when a budget runs out, the interval of x - y is reported
 def compare(x: Real, y: Real, epsilon: Fraction = EPSILON) -> ComparisonResult:
-    from reals.approximation import Approximation
-    x_approximation = Approximation(x)
-    x_approximation.improve()
-    y_approximation = Approximation(y)
-    y_approximation.improve()
-
+    x_approximation = x.approximation()
+    y_approximation = y.approximation()
+    try:
+        return compare_approximations(x_approximation, y_approximation, epsilon)
+    except reals._budget.BudgetExceeded as exceeded:
+        x_lower, x_upper = x_approximation.interval_fraction()
+        y_lower, y_upper = y_approximation.interval_fraction()
+        exceeded.interval = (x_lower - y_upper if x_lower is not None and y_upper is not None else None,
+                             x_upper - y_lower if x_upper is not None and y_lower is not None else None)
+        raise
+
+
+def compare_approximations(x_approximation: Approximation, y_approximation: Approximation,
+                           epsilon: Fraction) -> ComparisonResult:
     while True:
-        x_lower = x_approximation.lower_bound_fraction()
-        x_upper = x_approximation.upper_bound_fraction()
-        y_lower = y_approximation.lower_bound_fraction()
-        y_upper = y_approximation.upper_bound_fraction()
+        x_lower, x_upper = x_approximation.lower_bound_ratio(), x_approximation.upper_bound_ratio()
+        y_lower, y_upper = y_approximation.lower_bound_ratio(), y_approximation.upper_bound_ratio()
 
-        if x_upper is not None and y_lower is not None and x_upper < y_lower:
+        if x_upper is not None and y_lower is not None and is_smaller(x_upper, y_lower):
             return ComparisonResult.SMALLER
 
-        if x_lower is not None and y_upper is not None and y_upper < x_lower:
+        if y_upper is not None and x_lower is not None and is_smaller(y_upper, x_lower):
             return ComparisonResult.GREATER
 
-        x_eps = x_approximation.epsilon_fraction()
-        y_eps = y_approximation.epsilon_fraction()
+        x_narrow = is_narrower(x_lower, x_upper, epsilon / 2)
+        y_narrow = is_narrower(y_lower, y_upper, epsilon / 2)
+
+        if x_narrow and y_narrow:
+            return ComparisonResult.UNKNOWN
+
+        if not x_narrow:
+            improve(x_approximation)
+        if not y_narrow and y_approximation is not x_approximation:
+            improve(y_approximation)
+
+
+def improve(approximation: Approximation) -> None:
+    approximation.improve(max(approximation.ingestions, 1))
 
-        if not x_eps:
-            x_approximation.improve()
-        elif x_eps > epsilon / 2:
-            x_approximation.improve()
 
-        if not y_eps:
-            y_approximation.improve()
-        elif y_eps > epsilon / 2:
-            y_approximation.improve()
+def is_smaller(x: Ratio, y: Ratio) -> bool:
+    return x[0] * y[1] < y[0] * x[1]
 
-        if x_eps is not None and x_eps < epsilon / 2 and y_eps is not None and y_eps < epsilon / 2:
-            break
 
-    return ComparisonResult.UNKNOWN
+def is_narrower(lower: Optional[Ratio], upper: Optional[Ratio], epsilon: Fraction) -> bool:
+    if lower is None or upper is None:
+        return False
+    (p1, q1), (p2, q2) = lower, upper
+    return abs(p2 * q1 - p1 * q2) * epsilon.denominator < epsilon.numerator * q1 * q2
@@ -1,6 +1,13 @@
 import reals._term
 
-from typing import Iterator
+from typing import Any, Iterator, Optional
 
 
 Computation = Iterator[reals._term.Term]
+
+
+# the bit length of the largest coefficient that the computation currently holds, for the computations that report
+# it with a coefficient_bits method, such as the engines and the computations built from them
+def coefficient_bits(computation: Iterator[Any]) -> Optional[int]:
+    bits = getattr(computation, 'coefficient_bits', None)
+    return bits() if bits is not None else None
@@ -1,6 +1,7 @@
 import reals._real
 import reals._term
-import reals._normalize
+import reals._pi
+import reals._plan
 
 from typing import Generator
 
@@ -17,21 +18,7 @@ def e_term_generator() -> Generator[reals._term.Term, None, None]:
 
 e = reals._real.Real(e_term_generator())
 
-
-def pi_term_generator() -> Generator[reals._term.Term, None, None]:
-    yield (0, 4)
-
-    m = 1
-    n = 1
-    while True:
-        yield (m, n)
-        m += 2
-        n += m
-
-
-pi_unnormalized = reals._real.Real(pi_term_generator())
-
-pi = reals._normalize.normalize(pi_unnormalized)
+pi = reals._real.Real(reals._pi.pi_term_generator())
 
 
 def phi_term_generator() -> Generator[reals._term.Term, None, None]:
@@ -54,3 +41,8 @@ def _log2_helper() -> Generator[reals._term.Term, None, None]:
 		n += 1
 
 log2 = reals._real.Real(_log2_helper())
+
+e.plan = reals._plan.Plan(reals._plan.constant, ('e',), {})
+pi.plan = reals._plan.Plan(reals._plan.constant, ('pi',), {})
+phi.plan = reals._plan.Plan(reals._plan.constant, ('phi',), {})
+log2.plan = reals._plan.Plan(reals._plan.constant, ('log2',), {})
@@ -1,8 +1,9 @@
 from reals._real import Real, Number
-from reals._computation import Computation
-from reals.approximation import Approximation
+from reals._plan import planned
+from reals._monotone import MonotoneComputation, bit_burst
 from reals._algebraic_computation import AlgebraicComputation
 
+import functools
 from decimal import Decimal
 from fractions import Fraction
 from typing import Generator
@@ -17,38 +18,71 @@ def exp_frac_computation(x: int, y: int) -> Generator[tuple[int, int], None, Non
         m += incr
 
 
+# the continued fraction needs about |f| terms before it emits anything, so for a large argument it is evaluated at
+# f / 2^k instead, and the result is squared k times, where k is chosen such that |f| / 2^k < 2^HALVING_BITS
+HALVING_BITS = 9
+
+# the number of integer powers of e that are cached for exp_split
+INTEGER_POWERS = 64
+
+# the number of truncations of bit bursts whose exponentials are cached, see exp_truncations
+BURST_TRUNCATIONS = 256
+
+
 def exp_frac(f: Fraction) -> Real:
+    if f == 0:
+        return Real.from_int(1)
+
+    halvings = max(0, abs(round(f)).bit_length() - HALVING_BITS)
+    result = exp_burst(f / 2**halvings)
+    for _ in range(0, halvings):
+        result = result * result
+    return result
+
+
+# computes exp(f) as e^n exp(f - n), with n the integer closest to f; the bounds of a real argument are close to each
+# other, so they share e^n, which is cached
+def exp_split(f: Fraction) -> Real:
+    n = round(f)
+    if n == 0:
+        return exp_frac(f)
+    if f == n:
+        return exp_integer(n)
+    return exp_integer(n) * exp_burst(f - n)
+
+
+def exp_burst(f: Fraction) -> Real:
+    return exp_truncations(bit_burst(f))
+
+
+# the exponential of the last truncation, as the exponential of the one before times the exponential of their
+# difference; the bounds of a real argument share all but their last few truncations, and so do the bounds of the next
+# refinements, so they share the cached products and their terms
+@functools.lru_cache(maxsize=BURST_TRUNCATIONS)
+def exp_truncations(truncations: tuple[Fraction, ...]) -> Real:
+    if len(truncations) == 1:
+        return exp_continued_fraction(truncations[0])
+    return exp_truncations(truncations[:-1]) * exp_continued_fraction(truncations[-1] - truncations[-2])
+
+
+@functools.lru_cache(maxsize=INTEGER_POWERS)
+def exp_integer(n: int) -> Real:
+    return exp_frac(Fraction(n))
+
+
+def exp_continued_fraction(f: Fraction) -> Real:
     x, y = f.as_integer_ratio()
     x_squared = x * x
     computation = Real(exp_frac_computation(x, y)).compute()
     return Real(AlgebraicComputation(computation, (2 * y + x, x_squared, 2 * y - x, x_squared)))
 
 
-class ExponentialComputation(Computation):
+class ExponentialComputation(MonotoneComputation):
     def __init__(self, x: Real):
-        self.a = Approximation(x)
-        self.n = 0
-        self.increase_precision()
-
-    def increase_precision(self):
-        self.a.improve(10)
-        self.lo = exp_frac(self.a.lower_bound_fraction()).compute()
-        self.hi = exp_frac(self.a.upper_bound_fraction()).compute()
-        for _ in range(0, self.n):
-            next(self.lo)
-            next(self.hi)
-
-    def __next__(self) -> tuple[int, int]:
-        while True:
-            lower = next(self.lo)
-            upper = next(self.hi)
-            if lower == upper:
-                self.n += 1
-                return lower
-            else:
-                self.increase_precision()
+        super().__init__(x, exp_split)
 
 
+@planned
 def exp(x: Number) -> Real:
     if isinstance(x, int) or isinstance(x, Fraction) or isinstance(x, Decimal):
         p, q = x.as_integer_ratio()
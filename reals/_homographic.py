@@ -1,5 +1,7 @@
 import reals._term
 
+import math
+
 from typing import Optional
 
 
@@ -22,6 +24,12 @@ class Homographic:
         self.b, self.d = self.a, self.c
         return self.c == 0 and self.d == 0
 
+    # replace x by the homographic expression (a x + b) / (c x + d) given by coeffs
+    def compose(self, coeffs: tuple[int, int, int, int]) -> None:
+        a, b, c, d = coeffs
+        self.a, self.b = self.a * a + self.b * c, self.a * b + self.b * d
+        self.c, self.d = self.c * a + self.d * c, self.c * b + self.d * d
+
     def emit(self, term: reals._term.Term) -> bool:
         n, m = reals._term.expand_term(term)
         self.a, self.b = self.a - n * self.c, self.b - n * self.d
@@ -29,6 +37,17 @@ class Homographic:
         self.a, self.b, self.c, self.d = m * self.c, m * self.d, self.a, self.b
         return terminated
 
+    # divide out the common factor of the coefficients, returns the bit length of the largest coefficient
+    def reduce(self) -> int:
+        g = math.gcd(self.a, self.b, self.c, self.d)
+        if g > 1:
+            self.a, self.b, self.c, self.d = self.a // g, self.b // g, self.c // g, self.d // g
+        return self.bit_length()
+
+    # the bit length of the largest coefficient
+    def bit_length(self) -> int:
+        return max(self.a.bit_length(), self.b.bit_length(), self.c.bit_length(), self.d.bit_length())
+
     # returns an integer n such that self.evaluate(n) = n or self.evaluate(n) = n + 1
     def fix_point(self) -> Optional[int]:
         current_guess = self.guess_int()
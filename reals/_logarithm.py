@@ -1,9 +1,10 @@
 from reals._real import Real, Number
+from reals._plan import planned
 from reals._constants import log2
-from reals._computation import Computation
-from reals.approximation import Approximation
-from reals._quadratic_computation import QuadraticComputation
+from reals._monotone import MonotoneComputation, bit_burst
+from reals._algebraic_computation import AlgebraicComputation
 
+import functools
 from decimal import Decimal
 from fractions import Fraction
 from typing import Generator
@@ -22,41 +23,103 @@ def log_frac_computation(x: int, y: int) -> Generator[tuple[int, int], None, Non
         n += incr
 
 
-def log_frac(f: Fraction, N: int | None = None) -> Real:
+# log_frac_computation converges faster the closer its argument is to 1, so arguments are first reduced by factoring out
+# small primes, a power of two, and factors 1 + 2^-k for k up to MAX_REDUCTION_BITS, whose logs are cached; a larger
+# MAX_REDUCTION_BITS leaves an argument closer to 1 but adds more terms to the sum
+SMALL_PRIMES = (3, 5, 7)
+MAX_REDUCTION_BITS = 6
+
+# the number of truncations of bit bursts whose logs are cached, see log_truncations
+BURST_TRUNCATIONS = 256
+
+
+def log_frac(f: Fraction) -> Real:
     x, y = f.as_integer_ratio()
+    if x <= 0:
+        raise ValueError(f'Expected a positive number, got {f}')
+
+    terms = []
+    for prime in SMALL_PRIMES:
+        multiplicity = 0
+        while x % prime == 0:
+            x //= prime
+            multiplicity += 1
+        while y % prime == 0:
+            y //= prime
+            multiplicity -= 1
+        if multiplicity != 0:
+            terms.append(prime_log(prime) * multiplicity)
+
+    return Real.sum(terms + reduced_log(x, y))
+
+
+@functools.cache
+def prime_log(prime: int) -> Real:
+    return Real.sum(reduced_log(prime, 1))
 
-    if N is None:
-        N = (x // y).bit_length()
 
-    computation = Real(log_frac_computation(x, y << N)).compute()
-    return Real(QuadraticComputation(computation, log2.compute(), (0, 1, N, 0, 0, 0, 0, 1)))
+# the log of 1 + 2^-k
+@functools.cache
+def reduction_log(k: int) -> Real:
+    return Real(log_frac_computation((1 << k) + 1, 1 << k))
 
 
-class LogarithmicComputation(Computation):
+# returns a list of reals whose sum is log(x / y)
+def reduced_log(x: int, y: int) -> list[Real]:
+    terms = []
+
+    N = x.bit_length() - y.bit_length()
+    x, y = (x, y << N) if N >= 0 else (x << -N, y)
+    if x < y:
+        x <<= 1
+        N -= 1
+    if N != 0:
+        terms.append(log2 * N)
+
+    # x / y is in [1, 2) and is divided by 1 + 2^-k whenever it is at least 1 + 2^-k
+    for k in range(1, MAX_REDUCTION_BITS + 1):
+        while (x << k) >= y * ((1 << k) + 1):
+            x, y = x << k, y * ((1 << k) + 1)
+            terms.append(reduction_log(k))
+
+    if x != y:
+        terms.append(Real(log_frac_computation(x, y)))
+    return terms
+
+
+# computes log(f) as the log of f / 2^n in [1, 2), plus n log(2); the bounds of a real argument are close to each other,
+# so they share the logs of the truncations of f / 2^n, see bit_burst
+def log_split(f: Fraction) -> Real:
+    x, y = f.as_integer_ratio()
+    if x <= 0:
+        raise ValueError(f'Expected a positive number, got {f}')
+
+    n = x.bit_length() - y.bit_length()
+    x, y = x << max(0, -n), y << max(0, n)
+    if x < y:
+        x <<= 1
+        n -= 1
+    return log_truncations(n, bit_burst(Fraction(x, y)))
+
+
+# the log of 2^n times the last truncation, as the log of 2^n times the one before plus the log of their ratio, which
+# is close to 1 compared to the size of its numbers; the terms of that log are large generalized terms, which are
+# turned into regular ones before they are added
+@functools.lru_cache(maxsize=BURST_TRUNCATIONS)
+def log_truncations(n: int, truncations: tuple[Fraction, ...]) -> Real:
+    if len(truncations) == 1:
+        return log_frac(truncations[0] * Fraction(2)**n)
+    x, y = (truncations[-1] / truncations[-2]).as_integer_ratio()
+    ratio_log = Real(AlgebraicComputation(Real(log_frac_computation(x, y)).compute(), (1, 0, 0, 1)))
+    return log_truncations(n, truncations[:-1]) + ratio_log
+
+
+class LogarithmicComputation(MonotoneComputation):
     def __init__(self, x: Real):
-        self.a = Approximation(x)
-        self.n = 0
-        self.increase_precision()
-
-    def increase_precision(self):
-        self.a.improve(10)
-        self.lo = log_frac(self.a.lower_bound_fraction()).compute()
-        self.hi = log_frac(self.a.upper_bound_fraction()).compute()
-        for _ in range(0, self.n):
-            next(self.lo)
-            next(self.hi)
-
-    def __next__(self) -> tuple[int, int]:
-        while True:
-            lower = next(self.lo)
-            upper = next(self.hi)
-            if lower == upper:
-                self.n += 1
-                return lower
-            else:
-                self.increase_precision()
+        super().__init__(x, log_split)
 
 
+@planned
 def log(x: Number) -> Real:
     if isinstance(x, int) or isinstance(x, Fraction) or isinstance(x, Decimal):
         p, q = x.as_integer_ratio()
@@ -0,0 +1,228 @@
+import reals._term
+import reals._computation
+import reals._homographic
+import reals._algebraic_computation
+
+from reals._real import Real
+from reals.approximation import Approximation
+
+from fractions import Fraction
+from typing import Callable, Optional, Union
+
+INITIAL_STEP = 10
+
+# after this many refinements without emitting a term, the computation switches to emitting generalized terms, like
+# AlgebraicComputation does
+MAX_REFINEMENTS = 4
+
+# the bounds of x are rounded outwards to multiples of 2^-bits, where bits has this many more bits than the width of the
+# interval of x
+GUARD_BITS = 4
+
+# the first piece of a bit burst has this many bits after the radix point, see bit_burst
+BURST_BITS = 32
+
+
+# the terms of f(bound) after the ones that were already emitted, and the next term if it was computed but not emitted
+#
+# the terms are started when they are first needed rather than when the stream is created, so that a refinement
+# doesn't compute any terms, and an exception while starting them, such as an exceeded budget, leaves the stream in
+# a state from which it is started again
+class BoundStream:
+    def __init__(self, bound: tuple[int, int], tail: reals._homographic.Homographic,
+                 value: Union[Real, Fraction]) -> None:
+        self.bound = bound
+        self.tail = tail
+        self.value = value
+        self.terms: Optional[reals._computation.Computation] = None
+        self.pending: Optional[tuple[int, int]] = None
+        self.terminated = False
+
+    def peek(self) -> Optional[tuple[int, int]]:
+        if self.pending is None and not self.terminated:
+            if self.terms is None:
+                self.terms = self.start()
+            try:
+                self.pending = reals._term.expand_term(next(self.terms))
+            except StopIteration:
+                self.terminated = True
+        return self.pending
+
+    def start(self) -> reals._computation.Computation:
+        state = reals._homographic.Homographic(self.tail.a, self.tail.b, self.tail.c, self.tail.d)
+        if isinstance(self.value, Fraction):
+            # the rational is expanded directly, as (p y + p) / (q y + q) for an empty y
+            p, q = self.value.as_integer_ratio()
+            state.compose((p, p, q, q))
+            return reals._algebraic_computation.AlgebraicComputation(iter([]), (state.a, state.b, state.c, state.d))
+
+        # the engine takes its input to be a tail, which is at least 1, but the first term of f(bound) can be
+        # anything, so it is ingested before the engine could emit terms that only hold for tails
+        computation = self.value.compute()
+        state.ingest(next(computation))
+        return reals._algebraic_computation.AlgebraicComputation(computation, (state.a, state.b, state.c, state.d))
+
+
+# computes f(x) for a monotone function f, given a function that computes f on rationals; terms are emitted when f of
+# the lower and upper bound of x agree on them, otherwise x is refined with twice as many terms as the last time
+#
+# f(x) may be exactly on the boundary between two terms, like tan(pi), in which case the bounds never agree; after
+# MAX_REFINEMENTS refinements, a generalized term (n, 2) is emitted instead when the bounds have the terms n and n + 1
+#
+# the emitted terms are kept as a homographic expression that maps f(x) to the remaining tail, so that the stream of
+# a new bound starts at the tail instead of replaying all terms, and the stream of a bound that didn't change is kept
+#
+# the numerators and denominators of the convergents of x grow with every refinement, and f is slow on rationals with
+# large numbers, so the bounds are rounded outwards to the working precision: multiples of 2^-bits, where bits is a
+# few more than the width of the interval of x needs; bits never decreases, so the rounded intervals are nested like
+# the intervals of x, and f can split these bounds in pieces that get smaller as their numbers get larger, see
+# bit_burst
+class MonotoneComputation(reals._computation.Computation):
+    def __init__(self, x: Real, f: Callable[[Fraction], Real]) -> None:
+        self.f = f
+        self.approximation = Approximation(x)
+        self.step = INITIAL_STEP
+        # the number of terms of x that the last refinement ingests in total, which is kept when the refinement is
+        # interrupted, such as by an exceeded budget, so that it continues where it stopped rather than start over
+        self.target = 0
+        self.tail = reals._homographic.Homographic(1, 0, 0, 1)
+        self.lower: Optional[BoundStream] = None
+        self.upper: Optional[BoundStream] = None
+        self.simple_mode = True
+        # the bounds of x are rounded to multiples of 2^-bits
+        self.bits = 0
+        # the number of times x was refined, the number of streams that were started for a new bound, and how often
+        # the computation switched to emitting generalized terms
+        self.refinements = 0
+        self.replays = 0
+        self.non_simple_entries = 0
+
+    # the number of terms of x that were ingested
+    @property
+    def ingestions(self) -> int:
+        return self.approximation.ingestions
+
+    # the enclosure of x, and the bound streams, which are not cached and so don't report their coefficients by
+    # themselves
+    def coefficient_bits(self) -> int:
+        bits = [self.approximation.state.bit_length(), self.tail.bit_length()]
+        bits += [reals._computation.coefficient_bits(stream.terms) or 0
+                 for stream in (self.lower, self.upper) if stream is not None and stream.terms is not None]
+        return max(bits)
+
+    def refine(self) -> None:
+        if self.approximation.ingestions >= self.target:
+            self.target = self.approximation.ingestions + self.step
+            self.step *= 2
+            self.refinements += 1
+        self.approximation.improve(self.target - self.approximation.ingestions)
+
+        lower, upper = self.approximation.lower_bound_ratio(), self.approximation.upper_bound_ratio()
+        if lower is None or upper is None:
+            self.lower = self.upper = None
+            return
+
+        # x is a rational whose terms have all been ingested
+        if is_equal(lower, upper):
+            self.lower = self.upper = self.stream(lower, self.lower, None)
+            return
+
+        self.bits = max(self.bits, precision(lower, upper) + GUARD_BITS, sign_bits(lower), sign_bits(upper))
+        lower = ((lower[0] << self.bits) // lower[1], 1 << self.bits)
+        upper = (-((-upper[0] << self.bits) // upper[1]), 1 << self.bits)
+        self.lower = self.stream(lower, self.lower, False)
+        self.upper = self.stream(upper, self.upper, True)
+
+    # f at a rounded bound of x, or a lower or upper bound of it as given by upward, which may be a rational that
+    # subclasses compute faster than f itself
+    def bound_value(self, bound: Fraction, upward: bool) -> Union[Real, Fraction]:
+        return self.f(bound)
+
+    # the stream of f at a bound of x, which is exact if upward is None, and rounded otherwise
+    def stream(self, bound: tuple[int, int], previous: Optional[BoundStream], upward: Optional[bool]) -> BoundStream:
+        if previous is not None and previous.bound == bound:
+            return previous
+        self.replays += 1
+        tail = reals._homographic.Homographic(self.tail.a, self.tail.b, self.tail.c, self.tail.d)
+        value = self.f(Fraction(*bound)) if upward is None else self.bound_value(Fraction(*bound), upward)
+        return BoundStream(bound, tail, value)
+
+    # the streams of the same bounds, after a term that the streams didn't emit themselves
+    def restart(self) -> None:
+        streams = {}
+        for stream in (self.lower, self.upper):
+            if stream is not None and id(stream) not in streams:
+                tail = reals._homographic.Homographic(self.tail.a, self.tail.b, self.tail.c, self.tail.d)
+                streams[id(stream)] = BoundStream(stream.bound, tail, stream.value)
+        self.lower = None if self.lower is None else streams[id(self.lower)]
+        self.upper = None if self.upper is None else streams[id(self.upper)]
+
+    def __next__(self) -> reals._term.Term:
+        refinements = 0
+        while True:
+            if self.simple_mode and refinements > MAX_REFINEMENTS:
+                self.simple_mode = False
+                self.non_simple_entries += 1
+
+            if self.lower is not None and self.upper is not None:
+                lower, upper = self.lower.peek(), self.upper.peek()
+                if lower == upper:
+                    if lower is None:
+                        raise StopIteration()
+
+                    self.simple_mode = True
+                    self.lower.pending = self.upper.pending = None
+                    self.tail.emit(lower)
+                    n, m = lower
+                    return n if m == 1 else (n, m)
+                elif (not self.simple_mode and lower is not None and upper is not None and
+                        lower[1] == upper[1] == 1 and abs(lower[0] - upper[0]) == 1):
+                    term = (min(lower[0], upper[0]), 2)
+                    self.tail.emit(term)
+                    self.restart()
+                    return term
+
+            self.refine()
+            refinements += 1
+
+
+def is_equal(x: tuple[int, int], y: tuple[int, int]) -> bool:
+    return x[0] * y[1] == y[0] * x[1]
+
+
+# the number of bits after the radix point at which the interval [p1 / q1, p2 / q2] (where q1, q2 > 0) is about one
+# unit wide
+def precision(lower: tuple[int, int], upper: tuple[int, int]) -> int:
+    (p1, q1), (p2, q2) = lower, upper
+    return max(0, q1.bit_length() + q2.bit_length() - (p2 * q1 - p1 * q2).bit_length())
+
+
+# the number of bits after the radix point that keep a nonzero bound from being rounded to 0
+def sign_bits(bound: tuple[int, int]) -> int:
+    p, q = bound
+    return q.bit_length() - abs(p).bit_length() + 2 if p != 0 else 0
+
+
+# the truncations of f to BURST_BITS bits after the radix point, twice as many, and so on, rounded down, which end with
+# f itself once the denominator of f has no more bits, and without the ones that equal the one before or 0 (unless f
+# is 0); a truncation t is the one before plus a piece smaller than 2^(-k / 2) with k bits after the radix point, so
+# a function whose continued fraction needs fewer terms for smaller arguments, like exp, can evaluate the pieces with
+# numbers that are only as large as they need to be
+#
+# the truncations of nearby numbers start the same, so functions cache their values at the truncations, keyed on all
+# the truncations up to the one whose value is computed
+def bit_burst(f: Fraction) -> tuple[Fraction, ...]:
+    p, q = f.as_integer_ratio()
+    truncations = []
+    bits, previous = BURST_BITS, Fraction(0)
+    while q.bit_length() > bits:
+        truncated = Fraction((p << bits) // q, 1 << bits)
+        if truncated != previous:
+            truncations.append(truncated)
+        if truncated == f:
+            return tuple(truncations)
+        previous = truncated
+        bits *= 2
+    if f != previous or not truncations:
+        truncations.append(f)
+    return tuple(truncations)
@@ -0,0 +1,27 @@
+import reals._real
+
+import os
+import pickle
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional
+
+
+# evaluates every expression in a pool of worker processes, which receive the pickled plans of the expressions and
+# create them again; the digits are returned in the order of the expressions
+#
+# the workers are spawned rather than forked, since a fork while another thread holds the lock of a real would leave
+# the lock held forever in the worker
+def evaluate_many(xs: Iterable[reals._real.Number], digits: int, workers: Optional[int] = None,
+                  base: int = 10) -> list[str]:
+    plans = [pickle.dumps(reals._real.Real.from_number(x)) for x in xs]
+    if not plans:
+        return []
+
+    workers = min(workers or os.cpu_count() or 1, len(plans))
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return list(executor.map(evaluate_plan, plans, [digits] * len(plans), [base] * len(plans)))
+
+
+def evaluate_plan(plan: bytes, digits: int, base: int) -> str:
+    return pickle.loads(plan).evaluate(digits, base=base)
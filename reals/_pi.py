@@ -0,0 +1,121 @@
+import reals._homographic
+import reals._term
+import reals.approximation
+
+import math
+from typing import Generator, Iterable
+
+# the Chudnovsky series pi = 426880 sqrt(10005) / sum_k t_k, where t_k = (-1)^k (6k)! (13591409 + 545140134 k) /
+# ((3k)! (k!)^3 640320^(3k)); every term adds about 47 bits
+BITS_PER_TERM = 47
+INITIAL_TERMS = 8
+LEHMER_BITS = 256
+C3_OVER_24 = 640320**3 // 24
+
+
+# returns integers (P, Q, T) for the terms a <= k < b, such that the sum of the first b terms is T / Q when a = 0; the
+# halves are combined with a few multiplications of numbers of similar size
+def binary_split(a: int, b: int) -> tuple[int, int, int]:
+    if b - a == 1:
+        if a == 0:
+            P = Q = 1
+        else:
+            P = (6 * a - 5) * (2 * a - 1) * (6 * a - 1)
+            Q = a * a * a * C3_OVER_24
+        T = P * (13591409 + 545140134 * a)
+        return (P, Q, -T if a % 2 == 1 else T)
+
+    middle = (a + b) // 2
+    P1, Q1, T1 = binary_split(a, middle)
+    P2, Q2, T2 = binary_split(middle, b)
+    return (P1 * P2, Q1 * Q2, Q2 * T1 + P1 * T2)
+
+
+# rational bounds of pi from the first n terms of the series; the series alternates and its terms decrease, so the
+# sum lies between the partial sums of n and n + 1 terms, and sqrt(10005) is bounded by integer square roots; the
+# bounds are rounded outwards to fixed point numbers, which are much smaller than P, Q and T
+def pi_bounds(n: int) -> tuple[tuple[int, int], tuple[int, int]]:
+    P, Q, T = binary_split(0, n)
+    p, q, t = binary_split(n, n + 1)
+    # the partial sums are T / Q and (T q + P t) / (Q q)
+    s_lower, s_upper = sorted([T * q, T * q + P * t])
+    d = Q * q
+
+    bits = BITS_PER_TERM * (n + 1)
+    root = math.isqrt(10005 << (2 * bits))
+
+    lower = 426880 * root * d // s_upper
+    upper = -(-426880 * (root + 1) * d // s_lower)
+    return (lower, 1 << bits), (upper, 1 << bits)
+
+
+# the regular continued fraction of pi, emitting the terms on which both bounds agree; the bounds are mapped through
+# the homographic expression of the terms that were already emitted, so that their expansion starts at the tail
+#
+# the terms are found with Lehmer's method: the leading bits of the bounds give a slightly wider interval, whose
+# common terms are found with small numbers, and the expression of these terms is applied to the full bounds at once
+#
+# given the first terms of pi, such as precomputed ones, the generator starts with the expression of these terms, and
+# yields the terms after them
+def pi_term_generator(terms: Iterable[reals._term.Term] = ()) -> Generator[int, None, None]:
+    tail = reals._homographic.Homographic(1, 0, 0, 1)
+    given = list(terms)
+    if given:
+        # the inverse of the product of the terms, which maps pi to the tail after them
+        a, b, c, d = reals.approximation.term_product(given, 0, len(given))
+        tail = reals._homographic.Homographic(d, -b, -c, a)
+    n = INITIAL_TERMS
+    while True:
+        bounds = [apply(tail, bound) for bound in pi_bounds(n)]
+        # the tail of pi is at least 1, so a bound below 1 lies outside the interval that the terms so far determine,
+        # which only happens for too few terms of the series after starting from given terms
+        if any(p < q for p, q in bounds):
+            n *= 2
+            continue
+        precision = LEHMER_BITS
+        while True:
+            exact = precision >= max(x.bit_length() for bound in bounds for x in bound)
+            chunk = reals._homographic.Homographic(1, 0, 0, 1)
+            terms = common_terms(bounds if exact else widen(bounds, precision), chunk)
+            if not terms:
+                if exact:
+                    break
+                precision *= 2
+                continue
+
+            bounds = [apply(chunk, bound) for bound in bounds]
+            chunk.compose((tail.a, tail.b, tail.c, tail.d))
+            tail = chunk
+            precision = LEHMER_BITS
+            yield from terms
+
+        n *= 2
+
+
+def apply(h: reals._homographic.Homographic, ratio: tuple[int, int]) -> tuple[int, int]:
+    p, q = ratio
+    p, q = h.a * p + h.b * q, h.c * p + h.d * q
+    return (p, q) if q > 0 else (-p, -q)
+
+
+# bounds of the remaining tail are positive, so truncating the numerators and denominators to their leading bits
+# gives a lower and an upper bound for each of them
+def widen(bounds: list[tuple[int, int]], precision: int) -> list[tuple[int, int]]:
+    result = []
+    for p, q in bounds:
+        shift = max(0, min(p.bit_length(), q.bit_length()) - precision)
+        result += [(p >> shift, (q >> shift) + 1), ((p >> shift) + 1, q >> shift)]
+    return result
+
+
+# the continued fraction terms that all ratios share, which are also emitted into chunk
+def common_terms(ratios: list[tuple[int, int]], chunk: reals._homographic.Homographic) -> list[int]:
+    terms = []
+    while all(q != 0 for _, q in ratios):
+        term = ratios[0][0] // ratios[0][1]
+        if any(p // q != term for p, q in ratios):
+            break
+        terms.append(term)
+        chunk.emit(term)
+        ratios = [(q, p - term * q) for p, q in ratios]
+    return terms
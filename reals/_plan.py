@@ -0,0 +1,78 @@
+import reals._real
+
+import collections.abc
+import functools
+import importlib
+from typing import Any, Callable, Optional, TypeVar, cast
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+# the plan of a real is the function and the arguments that created it, which is how it is pickled: the terms of a
+# real come from generators, which can't be pickled, so it is created again from its plan when it is unpickled; reals
+# that were created from an iterator have no plan, and neither do the reals created from them
+#
+# the arguments that are reals are kept as their plans, which hold no terms, so that a plan doesn't keep the reals it
+# was created from alive; a plan is pickled as a call of its function, and unpickled as the real that the call returns
+class Plan:
+    def __init__(self, function: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]) -> None:
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+
+    def __reduce__(self) -> tuple[Callable[..., Any], tuple[Any, ...]]:
+        if self.kwargs:
+            return call, (self.function, self.args, self.kwargs)
+        return self.function, self.args
+
+
+def call(function: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+    return function(*args, **kwargs)
+
+
+# returns the plan itself when it is unpickled, so that a real and the plans of the reals created from it are all
+# unpickled as the same real
+def unpickle(x: Any) -> Any:
+    return x
+
+
+def planned(function: F) -> F:
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        # an iterator would be consumed by the call, so its elements are kept instead
+        args = tuple(list(arg) if isinstance(arg, collections.abc.Iterator) else arg for arg in args)
+        return record(function(*args, **kwargs), wrapper, args, kwargs)
+    return cast(F, wrapper)
+
+
+# a real that already has a plan keeps it, since any plan that creates the same number will do, which also covers
+# functions that return one of their arguments or a cached real, and reals that functions create internally
+def record(x: Any, function: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+    if x.plan is not None:
+        return x
+    planned_args = plans(args)
+    planned_kwargs = plans(kwargs.values()) if kwargs else []
+    if planned_args is not None and planned_kwargs is not None:
+        x.plan = Plan(function, tuple(planned_args), dict(zip(kwargs, planned_kwargs)))
+    return x
+
+
+# the values with every real replaced by its plan, including the reals in lists, or None if a real has no plan
+def plans(values: Any) -> Optional[list[Any]]:
+    result = []
+    for value in values:
+        if isinstance(value, list):
+            value = plans(value)
+            if value is None:
+                return None
+        elif isinstance(value, reals._real.Real):
+            value = value.plan
+            if value is None:
+                return None
+        result.append(value)
+    return result
+
+
+# the constants are pickled by name, so that they are unpickled as the constants of the process, with their terms
+def constant(name: str) -> Any:
+    return getattr(importlib.import_module('reals._constants'), name)
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import reals._real
+import reals._computation
+
+import time
+import types
+import threading
+from typing import Any, Iterator, Optional
+
+# the counters that computations keep, as attributes with these names; they are reported as the difference between
+# their values before and after profiling
+COUNTERS = ['ingestions', 'non_simple_entries', 'refinements', 'replays']
+
+# the profiler that records every term that a CachedComputation computes; while it is None, the only cost is a check
+# whenever a term is computed rather than read from the cache
+profiler: Optional[Profiler] = None
+
+
+# a real whose terms were computed while profiling, with the counters of its computation; the parent is the node that
+# first needed its terms, and the seconds exclude the time spent in the children
+class Node:
+    def __init__(self, computation: reals._real.CachedComputation, parent: Optional[Node]) -> None:
+        self.cache = computation.cache
+        self.iterator = computation.iterator
+        self.label = label(self.iterator)
+        self.parent = parent
+        self.children: list[Node] = []
+        self.terms = 0
+        self.seconds = 0.0
+        self.before = counters(self.iterator)
+        self.peak_bits = reals._computation.coefficient_bits(self.iterator)
+
+    def counters(self) -> dict[str, int]:
+        after = counters(self.iterator)
+        return {name: after[name] - self.before[name] for name in after}
+
+
+class Profiler:
+    def __init__(self) -> None:
+        self.nodes: dict[int, Node] = {}
+        self.roots: list[Node] = []
+        self.stack: list[Node] = []
+        self.thread = threading.get_ident()
+
+    # computes the next term of the computation, like CachedComputation does when profiling is off; only the terms
+    # computed by the thread that is profiling are recorded
+    def extend(self, computation: reals._real.CachedComputation) -> None:
+        if threading.get_ident() != self.thread:
+            computation.cache.extend(computation.iterator)
+            return
+
+        node = self.nodes.get(id(computation.cache))
+        if node is None:
+            parent = self.stack[-1] if self.stack else None
+            node = Node(computation, parent)
+            self.nodes[id(computation.cache)] = node
+            (parent.children if parent is not None else self.roots).append(node)
+
+        self.stack.append(node)
+        start = time.perf_counter()
+        try:
+            computation.cache.extend(computation.iterator)
+            node.terms += 1
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stack.pop()
+            node.seconds += elapsed
+            if self.stack:
+                self.stack[-1].seconds -= elapsed
+
+            bits = reals._computation.coefficient_bits(node.iterator)
+            if bits is not None:
+                node.peak_bits = max(node.peak_bits or 0, bits)
+
+    def __enter__(self) -> Profiler:
+        global profiler
+        if profiler is not None:
+            raise RuntimeError('Profiling is already in progress')
+        profiler = self
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        global profiler
+        profiler = None
+
+    def result(self) -> Profile:
+        return Profile(aggregate(self.roots, 0))
+
+
+# the nodes of the profile with the same label and the same path of labels from a root are aggregated into a row,
+# since a computation such as a MonotoneComputation creates many similar reals
+class Row:
+    def __init__(self, label: str, depth: int, nodes: list[Node]) -> None:
+        self.label = label
+        self.depth = depth
+        self.nodes = len(nodes)
+        self.terms = sum(node.terms for node in nodes)
+        self.seconds = sum(node.seconds for node in nodes)
+        self.total_seconds = self.seconds
+        self.counters: dict[str, int] = {}
+        for node in nodes:
+            for name, value in node.counters().items():
+                self.counters[name] = self.counters.get(name, 0) + value
+        peaks = [node.peak_bits for node in nodes if node.peak_bits is not None]
+        self.peak_bits = max(peaks) if peaks else None
+
+
+class Profile:
+    def __init__(self, rows: list[Row]) -> None:
+        self.rows = rows
+
+    @property
+    def seconds(self) -> float:
+        return sum(row.seconds for row in self.rows)
+
+    def total(self, name: str) -> int:
+        return sum(row.counters.get(name, 0) for row in self.rows)
+
+    def __str__(self) -> str:
+        headers = ['reals', 'terms', 'self (s)', 'total (s)', 'peak bits']
+        headers += [name.replace('_', '-') for name in COUNTERS]
+        widths = [max(len(header) + 2, 10) for header in headers]
+        width = max([len(row.label) + 2 * row.depth for row in self.rows] + [len('computation')])
+        lines = [f'{"computation":<{width}}' + ''.join(f'{header:>{w}}' for header, w in zip(headers, widths))]
+        for row in self.rows:
+            values = [row.nodes, row.terms, f'{row.seconds:.4f}', f'{row.total_seconds:.4f}', row.peak_bits]
+            values += [row.counters.get(name) for name in COUNTERS]
+            lines.append(f'{"  " * row.depth + row.label:<{width}}' +
+                         ''.join(f'{"-" if value is None else value:>{w}}' for value, w in zip(values, widths)))
+        lines.append(f'total time {self.seconds:.4f}s, ' + ', '.join(f'{self.total(name)} {name.replace("_", "-")}'
+                                                                     for name in COUNTERS))
+        return '\n'.join(lines)
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+def aggregate(nodes: list[Node], depth: int) -> list[Row]:
+    groups: dict[str, list[Node]] = {}
+    for node in nodes:
+        groups.setdefault(node.label, []).append(node)
+
+    rows = []
+    for group_label, group in groups.items():
+        row = Row(group_label, depth, group)
+        children = aggregate([child for node in group for child in node.children], depth + 1)
+        row.total_seconds += sum(child.total_seconds for child in children if child.depth == depth + 1)
+        rows += [row] + children
+    return rows
+
+
+def label(iterator: Iterator[Any]) -> str:
+    # a generator is labelled with the name of its function
+    if isinstance(iterator, types.GeneratorType):
+        return iterator.__name__
+    return type(iterator).__name__
+
+
+def counters(iterator: Iterator[Any]) -> dict[str, int]:
+    return {name: getattr(iterator, name) for name in COUNTERS if hasattr(iterator, name)}
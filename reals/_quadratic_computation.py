@@ -6,6 +6,12 @@ import reals._bihomographic
 
 DEFAULT_MAX_INGESTIONS = 15
 
+# the number of ingestions and emissions after which the common factor of the coefficients is divided out
+REDUCTION_INTERVAL = 16
+# the gcd takes time quadratic in the size of the coefficients while an update takes linear time, so the interval is
+# also at least the size of the largest coefficient divided by this
+BITS_PER_UPDATE = 32
+
 
 class QuadraticComputation(reals._computation.Computation):
     def __init__(self,
@@ -19,6 +25,17 @@ class QuadraticComputation(reals._computation.Computation):
         self.max_ingestions = max_ingestions
         self.terminated = False
         self.simple_mode = True
+        self.updates = 0
+        self.reduction_interval = REDUCTION_INTERVAL
+        self.next_reduction = REDUCTION_INTERVAL
+        self.max_coefficient_bits = 0
+        # the number of terms ingested from x and y, and how often the computation switched to emitting generalized
+        # terms
+        self.ingestions = 0
+        self.non_simple_entries = 0
+
+    def coefficient_bits(self) -> int:
+        return self.state.bit_length()
 
     def ingest_x(self) -> None:
         try:
@@ -35,6 +52,14 @@ class QuadraticComputation(reals._computation.Computation):
     def close_enough(self, a: int, b: int) -> bool:
         return (a == b) or (not self.simple_mode) and (a == b + 1 or b == a + 1)
 
+    # computing the gcd of large coefficients is expensive, so every time there turns out to be no common factor, the
+    # next reduction is postponed for twice as long
+    def reduce(self) -> None:
+        bits = self.state.bit_length()
+        reduced_bits = self.state.reduce()
+        self.reduction_interval = REDUCTION_INTERVAL if reduced_bits < bits else 2 * self.reduction_interval
+        self.next_reduction = self.updates + max(self.reduction_interval, reduced_bits // BITS_PER_UPDATE)
+
     def __next__(self) -> reals._term.Term:
         if self.terminated:
             raise StopIteration()
@@ -44,7 +69,13 @@ class QuadraticComputation(reals._computation.Computation):
 
         ingestions = 0
         while True:
-            self.simple_mode = self.simple_mode and ingestions < self.max_ingestions
+            self.updates += 1
+            if self.updates == self.next_reduction:
+                self.reduce()
+
+            if self.simple_mode and ingestions >= self.max_ingestions:
+                self.simple_mode = False
+                self.non_simple_entries += 1
 
             n00 = self.state.a + self.state.b + self.state.c + self.state.d
             d00 = self.state.e + self.state.f + self.state.g + self.state.h
@@ -89,7 +120,11 @@ class QuadraticComputation(reals._computation.Computation):
             ingestions += 1
             if x_ingest:
                 self.ingest_x()
+                self.ingestions += 1
             if y_ingest:
                 self.ingest_y()
+                self.ingestions += 1
+            # ingesting is the only update that makes the coefficients larger, so this is their maximum size
+            self.max_coefficient_bits = max(self.max_coefficient_bits, self.state.bit_length())
             if self.terminated:
                 raise StopIteration()
@@ -0,0 +1,73 @@
+import functools
+
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+# numbers with at most this many digits are converted with str(), which is quadratic in the number of digits but
+# fast for small numbers, and well within the minimum allowed value of sys.set_int_max_str_digits
+LEAF_DIGITS = 500
+
+# in bases that str() and format() don't support, numbers with at most this many digits are converted digit by digit
+SMALL_LEAF_DIGITS = 16
+
+FORMATS = {2: 'b', 8: 'o', 16: 'x'}
+
+# the powers of the bases that were used last are cached; conversions use one power per halving of their width, so
+# this covers numbers of any realistic size in a few bases
+POWERS = 256
+
+
+def check_base(base: int) -> None:
+    if not isinstance(base, int):
+        raise TypeError(f'Expected int, got {type(base)}')
+    if not 2 <= base <= 36:
+        raise ValueError(f'Expected a base from 2 to 36, got {base}')
+
+
+def is_power_of_two(base: int) -> bool:
+    return base & (base - 1) == 0
+
+
+# multiplies value by base^k, which is a shift if the base is a power of two
+def scale_up(value: int, base: int, k: int) -> int:
+    if is_power_of_two(base):
+        return value << (k * (base.bit_length() - 1))
+    return value * power(base, k)
+
+
+# converts a nonnegative integer smaller than base^width to a string of exactly width digits (padded with leading
+# zeros) by splitting it in two halves with a single division, and recursing on both halves
+def to_digits(n: int, width: int, base: int = 10) -> str:
+    assert n >= 0
+    if base in FORMATS:
+        return format(n, FORMATS[base]).zfill(width)
+    if is_power_of_two(base):
+        bits = base.bit_length() - 1
+        binary = format(n, 'b').zfill(width * bits)
+        return ''.join(DIGITS[int(binary[i:i + bits], 2)] for i in range(0, len(binary), bits))
+    if base == 10 and width <= LEAF_DIGITS:
+        return str(n).zfill(width)
+    if width <= SMALL_LEAF_DIGITS:
+        digits = []
+        for _ in range(0, width):
+            n, digit = divmod(n, base)
+            digits.append(DIGITS[digit])
+        return ''.join(reversed(digits))
+
+    half = width // 2
+    high, low = divmod(n, power(base, half))
+    return to_digits(high, width - half, base) + to_digits(low, half, base)
+
+
+def to_string(n: int, base: int = 10) -> str:
+    if n < 0:
+        return '-' + to_string(-n, base)
+    width = 1
+    while power(base, width) <= n:
+        width *= 2
+    return to_digits(n, width, base).lstrip('0') or '0'
+
+
+@functools.lru_cache(maxsize=POWERS)
+def power(base: int, k: int) -> int:
+    return base**k
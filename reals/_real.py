@@ -1,40 +1,84 @@
 from __future__ import annotations
 
 import reals._term
+import reals._radix
 import reals._inverse
+import reals._term_store
 import reals._computation
 import reals._homographic
 import reals._algebraic_computation
 import reals._quadratic_computation
-
+import reals._compare
+import reals._plan
+import reals._budget
+import reals._profile
+import reals.approximation
+
+import asyncio
+import math
+import threading
 from decimal import Decimal
 from fractions import Fraction
-from typing import Any, Generator, Iterable, Iterator, Union
+from typing import Any, AsyncGenerator, Callable, Generator, Iterable, Iterator, Optional, Union
 
 DEFAULT_DIGITS = 5
 
+# digits are emitted in chunks of at most 1/BULK_RATIO of the digits emitted so far, and at most MAX_CHUNK_DIGITS at
+# a time so that converting a chunk to a string stays cheap and within the limit of sys.set_int_max_str_digits
+BULK_RATIO = 8
+MAX_CHUNK_DIGITS = 600
+
+# when at least this many digits are requested beyond the ones that are known, they are extracted at once from a
+# rational enclosure instead of digit by digit
+FIXED_POINT_DIGITS = 2000
+
+# the digits that decide how a number is rounded are computed with at most this many terms per bit, plus a few more; a
+# number on a digit boundary, like 1/2 or 0, never has them determined, so beyond that it is rounded from its rational
+# enclosure, which is taken to be halfway between two roundings once it is this many bits narrower than the last digit
+ROUNDING_TERMS_PER_BIT = 2
+ROUNDING_EXTRA_TERMS = 64
+ROUNDING_GUARD_BITS = 64
+
+# aiter_digits gives control back to the event loop after computing for this many seconds, or after this many terms
+# were computed by the reals in the expression
+ASYNC_MAX_SECONDS = 0.005
+ASYNC_MAX_INGESTIONS = 256
+
 
 class CachedComputation(reals._computation.Computation):
-    def __init__(self, iterator: Iterator[reals._term.Term], cache: list[reals._term.Term]):
+    def __init__(self, iterator: Iterator[reals._term.Term], cache: reals._term_store.TermStore):
         self.cache = cache
         self.iterator = iterator
         self.index = 0
 
+    # terms that are already cached are read without locking; a missing term is computed while holding the lock of
+    # the cache, unless another thread computed it in the meantime
     def __next__(self) -> reals._term.Term:
-        assert self.index <= len(self.cache)
-
-        if self.index == len(self.cache):
-            self.cache.append(next(self.iterator))
-
         index = self.index
-        self.index += 1
-        return self.cache[index]
+        cache = self.cache
+        assert index <= len(cache)
+
+        if index == len(cache):
+            with cache.lock:
+                if index == len(cache):
+                    if reals._budget.budgets:
+                        reals._budget.charge(self)
+                    if reals._profile.profiler is None:
+                        cache.extend(self.iterator)
+                    else:
+                        reals._profile.profiler.extend(self)
+
+        self.index = index + 1
+        return cache[index]
 
 
 class Real:
     def __init__(self, it: Union[Iterator[reals._term.Term], Iterable[reals._term.Term]]) -> None:
         self.iterator = iter(it)
-        self.cache: list[reals._term.Term] = []
+        self.cache = reals._term_store.TermStore()
+        self.digit_cursors: dict[int, DigitCursor] = {}
+        self.shared_approximation: Optional[reals.approximation.Approximation] = None
+        self.plan: Optional[reals._plan.Plan] = None
 
     def compute(self) -> reals._computation.Computation:
         return CachedComputation(self.iterator, self.cache)
@@ -50,12 +94,14 @@ class Real:
         return Real.from_fractional(x)
 
     @staticmethod
+    @reals._plan.planned
     def from_int(n: int) -> 'Real':
         if not isinstance(n, int):
             raise TypeError(f'Expected int, got {type(n)}')
         return Real([n])
 
     @staticmethod
+    @reals._plan.planned
     def from_fraction(f: Fraction) -> 'Real':
         if not isinstance(f, Fraction):
             raise TypeError(f'Expected Fraction, got {type(f)}')
@@ -63,6 +109,7 @@ class Real:
         return Real(reals._algebraic_computation.AlgebraicComputation(iter([]), (p, p, q, q)))
 
     @staticmethod
+    @reals._plan.planned
     def from_decimal(d: Decimal) -> 'Real':
         if not isinstance(d, Decimal):
             raise TypeError(f'Expected Decimal, got {type(d)}')
@@ -70,6 +117,7 @@ class Real:
         return Real(reals._algebraic_computation.AlgebraicComputation(iter([]), (p, p, q, q)))
 
     @staticmethod
+    @reals._plan.planned
     def from_fractional(x: Union[int, Fraction, Decimal]):
         if isinstance(x, int):
             return Real.from_int(x)
@@ -81,6 +129,7 @@ class Real:
         return Real(reals._algebraic_computation.AlgebraicComputation(iter([]), (p, p, q, q)))
 
     @staticmethod
+    @reals._plan.planned
     def from_float(f: float) -> 'Real':
         if not isinstance(f, float):
             raise TypeError(f'Expected float, got {type(f)}')
@@ -91,16 +140,35 @@ class Real:
     def from_iter(i: Iterator[reals._term.Term]) -> 'Real':
         return Real(i)
 
+    @staticmethod
+    @reals._plan.planned
+    def sum(xs: Iterable[Number]) -> 'Real':
+        total, terms = split_rationals(xs, Fraction(0), lambda a, b: a + b)
+        result = balanced(terms, (0, 1, 1, 0, 0, 0, 0, 1)) if terms else Real.from_int(0)
+        return result + total if total != 0 else result
+
+    @staticmethod
+    @reals._plan.planned
+    def prod(xs: Iterable[Number]) -> 'Real':
+        total, terms = split_rationals(xs, Fraction(1), lambda a, b: a * b)
+        if total == 0 or not terms:
+            return Real.from_fraction(total)
+        result = balanced(terms, (1, 0, 0, 0, 0, 0, 0, 1))
+        return result * total if total != 1 else result
+
+    @reals._plan.planned
     def inverse(self):
         return Real(reals._inverse.InverseComputation(self.compute()))
 
+    @reals._plan.planned
     def __neg__(self):
-        return Real(reals._algebraic_computation.AlgebraicComputation(self.compute(), (-1, 0, 0, 1)))
+        return apply_homographic(self, (-1, 0, 0, 1))
 
+    @reals._plan.planned
     def __mul__(self, other):
         if isinstance(other, Fraction) or isinstance(other, int) or isinstance(other, Decimal):
             p, q = other.as_integer_ratio()
-            return Real(reals._algebraic_computation.AlgebraicComputation(self.compute(), (p, 0, 0, q)))
+            return apply_homographic(self, (p, 0, 0, q))
         elif isinstance(other, Real):
             return Real(reals._quadratic_computation.QuadraticComputation(
                     self.compute(),
@@ -109,90 +177,207 @@ class Real:
         else:
             raise_typeerror(other)
 
+    @reals._plan.planned
     def __rmul__(self, other):
         if isinstance(other, Fraction) or isinstance(other, int) or isinstance(other, Decimal):
             p, q = other.as_integer_ratio()
-            return Real(reals._algebraic_computation.AlgebraicComputation(self.compute(), (p, 0, 0, q)))
+            return apply_homographic(self, (p, 0, 0, q))
         else:
             raise_typeerror(other)
 
+    @reals._plan.planned
     def __add__(self, other):
         if isinstance(other, Fraction) or isinstance(other, int) or isinstance(other, Decimal):
             p, q = other.as_integer_ratio()
-            return Real(reals._algebraic_computation.AlgebraicComputation(self.compute(), (q, p, 0, q)))
+            return apply_homographic(self, (q, p, 0, q))
         elif isinstance(other, Real):
             return Real(reals._quadratic_computation.QuadraticComputation(self.compute(), other.compute(),
                                                                           (0, 1, 1, 0, 0, 0, 0, 1)))
         else:
             raise_typeerror(other)
 
+    @reals._plan.planned
     def __radd__(self, other):
         if isinstance(other, Fraction) or isinstance(other, int) or isinstance(other, Decimal):
             p, q = other.as_integer_ratio()
-            return Real(reals._algebraic_computation.AlgebraicComputation(self.compute(), (q, p, 0, q)))
+            return apply_homographic(self, (q, p, 0, q))
         else:
             raise_typeerror(other)
 
+    @reals._plan.planned
     def __sub__(self, other):
         if isinstance(other, Fraction) or isinstance(other, int) or isinstance(other, Decimal):
             p, q = other.as_integer_ratio()
-            return Real(reals._algebraic_computation.AlgebraicComputation(self.compute(), (q, -p, 0, q)))
+            return apply_homographic(self, (q, -p, 0, q))
         elif isinstance(other, Real):
             return Real(reals._quadratic_computation.QuadraticComputation(self.compute(),
                                                                           other.compute(), (0, 1, -1, 0, 0, 0, 0, 1)))
         else:
             raise_typeerror(other)
 
+    @reals._plan.planned
     def __rsub__(self, other):
         if isinstance(other, Fraction) or isinstance(other, int) or isinstance(other, Decimal):
             p, q = other.as_integer_ratio()
-            return Real(reals._algebraic_computation.AlgebraicComputation(self.compute(), (-q, p, 0, q)))
+            return apply_homographic(self, (-q, p, 0, q))
         else:
             raise_typeerror(other)
 
+    @reals._plan.planned
     def __truediv__(self, other):
         if isinstance(other, Fraction) or isinstance(other, int) or isinstance(other, Decimal):
             p, q = other.as_integer_ratio()
-            return Real(reals._algebraic_computation.AlgebraicComputation(self.compute(), (q, 0, 0, p)))
+            return apply_homographic(self, (q, 0, 0, p))
         elif isinstance(other, Real):
             return Real(reals._quadratic_computation.QuadraticComputation(self.compute(),
                                                                           other.compute(), (0, 1, 0, 0, 0, 0, 1, 0)))
         else:
             raise_typeerror(other)
 
+    @reals._plan.planned
     def __rtruediv__(self, other):
         if isinstance(other, Fraction) or isinstance(other, int) or isinstance(other, Decimal):
             p, q = other.as_integer_ratio()
-            return Real(reals._algebraic_computation.AlgebraicComputation(self.compute(), (0, p, q, 0)))
+            return apply_homographic(self, (0, p, q, 0))
         else:
             raise_typeerror(other)
 
+    # integer exponents use repeated squaring, and rational exponents p / q an exact qth root followed by an integer
+    # power; only real exponents go through exp and log; the modules for roots, exp and log depend on Real, so they
+    # are imported here rather than when this module is loaded
+    @reals._plan.planned
     def __pow__(self, other):
+        if isinstance(other, int):
+            return integer_power(self, other)
+        if isinstance(other, Fraction) or isinstance(other, Decimal):
+            import reals._root
+            p, q = other.as_integer_ratio()
+            return integer_power(reals._root.root(self, q), p)
+
         import reals._logarithm
         import reals._exponential
         return reals._exponential.exp(reals._logarithm.log(self) * other)
 
     def __lt__(self, other: Real) -> bool:
-        from reals._compare import compare, ComparisonResult
-        return compare(self, other) == ComparisonResult.SMALLER
+        return reals._compare.compare(self, other) == reals._compare.ComparisonResult.SMALLER
 
     def __gt__(self, other: Real) -> bool:
-        from reals._compare import compare, ComparisonResult
-        return compare(self, other) == ComparisonResult.GREATER
+        return reals._compare.compare(self, other) == reals._compare.ComparisonResult.GREATER
 
     def __eq__(self, other) -> bool:
-        from reals._compare import compare, ComparisonResult
-        return compare(self, other) == ComparisonResult.UNKNOWN
+        return reals._compare.compare(self, other) == reals._compare.ComparisonResult.UNKNOWN
+
+    # a real is pickled as the plan that created it, see reals._plan
+    def __reduce__(self) -> tuple[Callable[..., Real], tuple[Any, ...]]:
+        if self.plan is None:
+            raise TypeError('Only reals created from numbers, constants, operators and the functions of reals can be '
+                            'pickled, not reals created from an iterator')
+        return reals._plan.unpickle, (self.plan,)
+
+    # a rational enclosure of the number, shared by all comparisons and conversions to float of this real
+    def approximation(self) -> reals.approximation.Approximation:
+        if self.shared_approximation is None:
+            with self.cache.lock:
+                if self.shared_approximation is None:
+                    self.shared_approximation = reals.approximation.Approximation(self)
+        return self.shared_approximation
+
+    # the digits of the number in the given base, shared by all evaluations of this real
+    def digits(self, base: int = 10) -> DigitCursor:
+        reals._radix.check_base(base)
+        cursor = self.digit_cursors.get(base)
+        if cursor is None:
+            cursor = self.digit_cursors.setdefault(base, DigitCursor(self, base))
+        return cursor
+
+    # yields the integer part (including the sign), followed by the digits after the radix point one at a time
+    def iter_digits(self, base: int = 10) -> Generator[str, None, None]:
+        cursor = self.digits(base)
+        cursor.extend(0)
+        yield cursor.integer_part
+
+        index = 0
+        while True:
+            if index == len(cursor.fraction):
+                cursor.extend(index + 1)
+                if index == len(cursor.fraction):
+                    return
+            yield cursor.fraction[index]
+            index += 1
+
+    # like iter_digits, but the digits are computed in slices of at most max_ingestions terms or max_seconds, after
+    # each of which control is given back to the event loop, where a cancelled task stops; a slice is a budget, which
+    # counts the terms that any real in the expression computes, so that a slice ends between two terms of whichever
+    # real is being computed, from which the computation continues in the next slice
+    #
+    # the terms are counted when they are started, so a slice can end before any term is completed when the terms are
+    # nested deeper than a slice allows; a slice that runs out of terms before the real is ingested or a digit emitted
+    # gives the next one twice as many, so that some term is completed eventually
+    async def aiter_digits(self, base: int = 10, max_ingestions: int = ASYNC_MAX_INGESTIONS,
+                           max_seconds: float = ASYNC_MAX_SECONDS) -> AsyncGenerator[str, None]:
+        cursor = self.digits(base)
+        index = -1  # the integer part comes first
+        scale = 1
+        while True:
+            while not cursor.integer_part if index < 0 else index == len(cursor.fraction):
+                # another thread or task is computing digits, and the known digits are read without the lock
+                while not cursor.lock.acquire(blocking=False):
+                    await asyncio.sleep(0)
+
+                budget = reals._budget.Budget(max_ingestions=scale * max_ingestions, seconds=max_seconds)
+                try:
+                    with budget:
+                        chunk = cursor.advance()
+                except reals._budget.BudgetExceeded as exceeded:
+                    if exceeded.budget is not budget:
+                        exceeded.interval = reals._budget.cached_interval(self)
+                        raise
+                    if exceeded.resource == 'ingestions':
+                        scale *= 2
+                    chunk = ''
+                else:
+                    scale = 1
+                finally:
+                    cursor.lock.release()
+
+                if chunk is None:
+                    return
+                await asyncio.sleep(0)
 
-    def evaluate(self, n: int, round: bool = True) -> str:
-        return rounded_digits(self, n) if round else digits(self, n)
+            yield cursor.integer_part if index < 0 else cursor.fraction[index]
+            index += 1
+
+    def evaluate(self, n: int, round: bool = True, base: int = 10) -> str:
+        try:
+            return rounded_digits(self, n, base) if round else digits(self, n, base)
+        except reals._budget.BudgetExceeded as exceeded:
+            exceeded.interval = reals._budget.cached_interval(self)
+            raise
+
+    # evaluates n digits while recording the work done by every real in the expression whose terms are computed,
+    # which is reported by the result; terms that were already computed don't show up
+    def profile(self, n: int, base: int = 10) -> reals._profile.Profile:
+        with reals._profile.Profiler() as profiler:
+            self.evaluate(n, base=base)
+        return profiler.result()
+
+    # the first n binary digits after the radix point of a number in [0, 1), packed with the most significant bit first
+    # and padded with zero bits to a whole number of bytes; the bytes hold no integer part or sign, so other numbers
+    # raise a ValueError rather than be confused with their fractional part
+    def to_bytes(self, n: int) -> bytes:
+        cursor = self.digits(2)
+        cursor.extend(n)
+        if cursor.integer_part != '0':
+            raise ValueError(f'Expected a number in [0, 1), got {self!s}')
+        bits = ''.join(cursor.fraction[:n]).ljust(n, '0')
+        padding = -n % 8
+        return (int(bits or '0', 2) << padding).to_bytes((n + padding) // 8, 'big')
 
     def to_decimal(self, n: int) -> Decimal:
         return Decimal(self.evaluate(n))
 
     def to_float(self) -> float:
-        import reals.approximation  # this is ugly but necessary to avoid circular imports
-        return reals.approximation.closest_float(self)  # noqa
+        return self.approximation().closest_float()
 
     def __format__(self, spec):
         assert spec[0] == '.'
@@ -208,70 +393,301 @@ class Real:
                 f'(approximate value: {str(self)})>')
 
 
-def rounded_digits(x: Real, n: int) -> str:
-    rounding_constant = Fraction(1, 2 * 10**n)
-    return digits(x + rounding_constant, n)
-
-
-def digits(x: Real, n: int) -> str:
-    digit_generator = digits_helper(x.compute())
-    digits = str(next(digit_generator))
-    try:
-        digits += '.'
-        for _ in range(n):
-            digits += next(digit_generator)
-    except StopIteration:
-        return digits
-    return digits
-
-
-def digits_helper(c: reals._computation.Computation) -> Generator[str, None, None]:
+class DigitCursor:
+    def __init__(self, x: Real, base: int) -> None:
+        self.x = x
+        self.base = base
+        self.generator = digits_helper(x.compute(), base)
+        self.generated = -1  # the number of digits after the decimal point yielded by the generator, or -1 if none
+        self.integer_part = ''
+        self.fraction: list[str] = []
+        self.exhausted = False
+        self.ingestions = 0  # the number of terms of the real that the generator ingested
+        # the rational enclosure that fixed_point_digits refines, kept so that every extension continues from the last
+        self.approximation: Optional[reals.approximation.Approximation] = None
+        # held while digits are computed; the digits that are known are read without it
+        self.lock = threading.Lock()
+
+    # makes sure that at least n digits after the radix point are known, unless the expansion terminates earlier or
+    # they take more than max_ingestions terms of the real; returns whether they are known
+    def extend(self, n: int, max_ingestions: Optional[int] = None) -> bool:
+        if self.integer_part and (len(self.fraction) >= n or self.exhausted):
+            return True
+        with self.lock:
+            return self.extend_locked(n, max_ingestions)
+
+    def extend_locked(self, n: int, max_ingestions: Optional[int] = None) -> bool:
+        # the generator has to catch up with the digits that are already known before it yields new ones, so once
+        # it is far behind, more digits are extracted at once, and a bit more than needed to avoid doing this often
+        if n - self.generated >= FIXED_POINT_DIGITS and not self.exhausted:
+            if n > len(self.fraction):
+                n = max(n, len(self.fraction) + len(self.fraction) // BULK_RATIO)
+                if self.approximation is None:
+                    self.approximation = reals.approximation.Approximation(self.x)
+                result = fixed_point_digits(self.approximation, n, self.base, max_ingestions)
+                if result is None:
+                    return False
+                self.integer_part, fraction = result
+                self.fraction.extend(fraction[len(self.fraction):])
+            return True
+
+        while not self.integer_part or len(self.fraction) < n:
+            if max_ingestions is not None and self.ingestions >= max_ingestions:
+                return False
+            if self.advance() is None:
+                break
+        return True
+
+    # resumes the generator until it ingests a term of the real or yields digits, which are added to the known ones;
+    # returns the digits, an empty string after an ingestion, or None once the expansion has terminated, and has to be
+    # called while holding the lock
+    def advance(self) -> Optional[str]:
+        try:
+            chunk = next(self.generator)
+        except StopIteration:
+            self.exhausted = True
+            return None
+
+        if isinstance(chunk, reals._budget.BudgetExceeded):
+            raise chunk
+
+        if not chunk:
+            self.ingestions += 1
+            return chunk
+        if self.generated < 0:
+            self.integer_part = chunk
+            self.generated = 0
+            return chunk
+
+        # digits that were already obtained through fixed_point_digits are skipped
+        if self.generated + len(chunk) > len(self.fraction):
+            self.fraction.extend(chunk[len(self.fraction) - self.generated:])
+        self.generated += len(chunk)
+        return chunk
+
+
+# rounds half away from zero, so that the magnitude of the result is rounded like a nonnegative number
+def rounded_digits(x: Real, n: int, base: int = 10) -> str:
+    cursor = x.digits(base)
+
+    # in an odd base, whether the remaining digits are more than half a unit can't be seen from the next digit
+    max_ingestions = ROUNDING_TERMS_PER_BIT * math.ceil((n + 1) * math.log2(base)) + ROUNDING_EXTRA_TERMS
+    if base % 2 == 1 or not cursor.extend(n + 1, max_ingestions):
+        return enclosure_digits(x.approximation(), n, base)
+
+    integer_part, fraction = cursor.integer_part, ''.join(cursor.fraction[:n]).ljust(n, '0')
+    if len(cursor.fraction) > n and reals._radix.DIGITS.index(cursor.fraction[n]) >= base // 2:
+        fraction, carry = increment(fraction, base)
+        if carry:
+            sign = '-' if integer_part.startswith('-') else ''
+            magnitude, carry = increment(integer_part.lstrip('-'), base)
+            integer_part = sign + ('1' if carry else '') + magnitude
+
+    return integer_part + '.' + fraction
+
+
+# rounds half away from zero from the rational enclosure of x, which is refined until both of its bounds round to the
+# same number, or until it is so narrow that x is taken to be halfway, in which case the bound farther from zero is
+# rounded
+def enclosure_digits(approximation: reals.approximation.Approximation, n: int, base: int = 10) -> str:
+    while True:
+        lower, upper = approximation.lower_bound_ratio(), approximation.upper_bound_ratio()
+        if lower is not None and upper is not None:
+            (p1, q1), (p2, q2) = lower, upper
+            low, high = round_ratio(p1, q1, n, base), round_ratio(p2, q2, n, base)
+            rounded = max(low, high, key=abs)
+            if low == high or reals._radix.scale_up(abs(p2 * q1 - p1 * q2), base, n) << ROUNDING_GUARD_BITS < q1 * q2:
+                break
+        approximation.improve(max(approximation.ingestions // 16, 1))
+
+    integer_part, fraction = divmod(abs(rounded), reals._radix.power(base, n))
+    sign = '-' if rounded < 0 or (p1 < 0 and p2 < 0) else ''
+    fraction_digits = reals._radix.to_digits(fraction, n, base) if n > 0 else ''
+    return sign + reals._radix.to_string(integer_part, base) + '.' + fraction_digits
+
+
+# p / q times base^n rounded half away from zero, where q > 0
+def round_ratio(p: int, q: int, n: int, base: int) -> int:
+    magnitude = (2 * reals._radix.scale_up(abs(p), base, n) + q) // (2 * q)
+    return magnitude if p >= 0 else -magnitude
+
+
+def digits(x: Real, n: int, base: int = 10) -> str:
+    cursor = x.digits(base)
+    cursor.extend(n)
+    return cursor.integer_part + '.' + ''.join(cursor.fraction[:n]).ljust(n, '0')
+
+
+# adds one to the last digit of a string of digits in the given base, returns the result and whether it overflowed
+def increment(digits: str, base: int = 10) -> tuple[str, bool]:
+    largest = reals._radix.DIGITS[base - 1]
+    stripped = digits.rstrip(largest)
+    if not stripped:
+        return '0' * len(digits), True
+    last = reals._radix.DIGITS[reals._radix.DIGITS.index(stripped[-1]) + 1]
+    return stripped[:-1] + last + '0' * (len(digits) - len(stripped)), False
+
+
+# yields the integer part, followed by chunks of digits after the radix point; once a number of digits is known,
+# chunks of up to that number divided by BULK_RATIO digits are emitted at once; after every term of c that is ingested
+# an empty chunk is yielded, so that the caller can pause between terms
+#
+# an exception inside a generator ends it, so when a budget runs out while a term is computed, the exception is
+# yielded instead of raised, and the term is computed again when the generator is resumed
+def digits_helper(c: reals._computation.Computation,
+                  base: int = 10) -> Generator[Union[str, reals._budget.BudgetExceeded], None, None]:
     h = reals._homographic.Homographic(1, 0, 0, 1)
+    determinant = 1
     terminated = False
-    is_negative = False
+    emitted = -1
 
     assert not (h.c == 0 and h.d == 0)
 
     while not (h.c == 0 and h.d == 0):
         if h.c != 0 and h.c + h.d != 0:
-            n1 = h.a // h.c
-            n2 = (h.a + h.b) // (h.c + h.d)
-            if n1 == n2:
-                digit = n1
-
-                h.a, h.b = h.a - digit * h.c, h.b - digit * h.d
-                h.a, h.b = h.a * 10, h.b * 10
-
-                if (not is_negative) and digit < 0:
-                    is_negative = True
-                    digit += 1
-                    if digit == 0:
-                        yield '-' + str(digit)
-                    else:
-                        yield str(digit)
-                elif is_negative:
-                    if digit > 0 and h.a == 0 and h.b == 0:
-                        digit = 10 - digit
-                        is_negative = False
+            if emitted < 0:
+                n1 = h.a // h.c
+                n2 = (h.a + h.b) // (h.c + h.d)
+                if n1 == n2:
+                    h.a, h.b = h.a - n1 * h.c, h.b - n1 * h.d
+                    emitted = 0
+
+                    # for a negative number x that is not an integer, the digits after the decimal point are the
+                    # digits of 1 - (x - floor(x)), so that the digits of the magnitude are emitted
+                    if n1 < 0 and not (h.a == 0 and h.b == 0):
+                        h.a, h.b = h.c - h.a, h.d - h.b
+                        determinant = -determinant
+                        yield reals._radix.to_string(n1 + 1, base) if n1 + 1 != 0 else '-0'
                     else:
-                        digit = 9 - digit
-                    yield str(digit)
-                else:
-                    yield str(digit)
-
-                continue
+                        yield reals._radix.to_string(n1, base)
+
+                    continue
+            else:
+                k = min(max(emitted // BULK_RATIO, 1), MAX_CHUNK_DIGITS)
+                if k == 1 or terminated or known_digits(h, determinant, base) >= k:
+                    chunk = emit_digits(h, k, base)
+                    if chunk is None and k > 1:
+                        k = 1
+                        chunk = emit_digits(h, k, base)
+
+                    if chunk is not None:
+                        determinant = reals._radix.scale_up(determinant, base, k)
+                        emitted += k
+                        yield reals._radix.to_digits(chunk, k, base)
+                        continue
 
         assert not terminated
         try:
-            h.ingest(next(c))
+            term = next(c)
+            h.ingest(term)
+            determinant *= -reals._term.expand_term(term)[1]
         except StopIteration:
             h.ingest_inf()
+            determinant = 0
             terminated = True
+        except reals._budget.BudgetExceeded as exceeded:
+            yield exceeded
+            continue
+        yield ''
+
+
+# returns the integer part and the first n digits after the decimal point of x, truncated towards zero, like
+# digits_helper does; instead of emitting digits, the rational enclosure of x is refined until floor(|x| 10^n) is
+# determined, which is then converted to decimal at once, or None if that takes more than max_ingestions terms
+def fixed_point_digits(approximation: reals.approximation.Approximation, n: int, base: int = 10,
+                       max_ingestions: Optional[int] = None) -> Optional[tuple[str, str]]:
+    target_bits = math.ceil(n * math.log2(base)) + 2
+
+    magnitude = None
+    while magnitude is None:
+        if max_ingestions is not None and approximation.ingestions > max_ingestions:
+            return None
+        lower, upper = approximation.lower_bound_ratio(), approximation.upper_bound_ratio()
+        if lower is not None and upper is not None:
+            known_bits = lower[1].bit_length() + upper[1].bit_length()
+            if known_bits >= target_bits or lower[0] * upper[1] == upper[0] * lower[1]:
+                magnitude = fixed_point_magnitude(lower, upper, n, base)
+            else:
+                # estimate the number of terms that is still needed from the number of bits per term so far, but
+                # at most double the number of terms since the first terms may not be representative
+                needed = (target_bits - known_bits) * approximation.ingestions // known_bits + 1
+                approximation.improve(min(needed, approximation.ingestions))
+                continue
+        approximation.improve(max(approximation.ingestions // 16, 1))
+
+    integer_part, fraction = divmod(magnitude, reals._radix.power(base, n))
+    sign = '-' if lower[0] < 0 else ''
+    return sign + reals._radix.to_string(integer_part, base), reals._radix.to_digits(fraction, n, base)
+
+
+# returns floor(|x| base^n) if it is the same for all x in the interval [p1 / q1, p2 / q2] (where q1, q2 > 0)
+def fixed_point_magnitude(lower: tuple[int, int], upper: tuple[int, int], n: int, base: int) -> Optional[int]:
+    (p1, q1), (p2, q2) = lower, upper
+    if p1 < 0 <= p2:
+        return None
+    if p1 < 0:
+        (p1, q1), (p2, q2) = (-p2, q2), (-p1, q1)
+    n1, n2 = reals._radix.scale_up(p1, base, n) // q1, reals._radix.scale_up(p2, base, n) // q2
+    return n1 if n1 == n2 else None
+
+
+# if h represents a number in [0, 1), returns the first k digits after the radix point as an integer if they are
+# determined, and replaces h by the number formed by the digits after those
+def emit_digits(h: reals._homographic.Homographic, k: int, base: int = 10) -> Optional[int]:
+    a, b = reals._radix.scale_up(h.a, base, k), reals._radix.scale_up(h.b, base, k)
+    n1 = a // h.c
+    n2 = (a + b) // (h.c + h.d)
+    if n1 != n2:
+        return None
+    h.a, h.b = a - n1 * h.c, b - n1 * h.d
+    return n1
+
+
+# a lower bound for the number of digits that is determined by the interval [a / c, (a + b) / (c + d)], whose width
+# is |ad - bc| / |c(c + d)|
+def known_digits(h: reals._homographic.Homographic, determinant: int, base: int = 10) -> int:
+    if determinant == 0:
+        return MAX_CHUNK_DIGITS
+    bits = h.c.bit_length() + (h.c + h.d).bit_length() - 2 - determinant.bit_length()
+    return int(bits / math.log2(base)) - 1
 
 
 Number = Union[int, Decimal, Fraction, Real]
 
 
+# computes (a x + b) / (c x + d); if x is itself an unconsumed homographic expression, the two are composed into a
+# single AlgebraicComputation so that a chain of scalar operations doesn't stack one engine per operation
+def apply_homographic(x: Real, coeffs: tuple[int, int, int, int]) -> Real:
+    inner = x.iterator
+    if (isinstance(inner, reals._algebraic_computation.AlgebraicComputation) and
+            isinstance(inner.x, CachedComputation) and inner.x.index == 0 and len(x.cache) == 0):
+        state = reals._homographic.Homographic(*coeffs)
+        state.compose((inner.state.a, inner.state.b, inner.state.c, inner.state.d))
+        return Real(reals._algebraic_computation.AlgebraicComputation(
+            CachedComputation(inner.x.iterator, inner.x.cache),
+            (state.a, state.b, state.c, state.d),
+            max(inner.max_ingestions, reals._algebraic_computation.DEFAULT_MAX_INGESTIONS)))
+
+    return Real(reals._algebraic_computation.AlgebraicComputation(x.compute(), coeffs))
+
+
+# the squares x^(2^i) for the bits i of n are multiplied in a balanced tree, and a negative n inverts the result; the
+# inverse is a homographic function, since inverse() only shifts the terms, which doesn't work for negative numbers
+def integer_power(x: Real, n: int) -> Real:
+    if n < 0:
+        return apply_homographic(integer_power(x, -n), (0, 1, 1, 0))
+
+    factors = []
+    square = x
+    while n > 0:
+        if n & 1:
+            factors.append(square)
+        n >>= 1
+        if n > 0:
+            square = square * square
+    return Real.prod(factors)
+
+
 def ensure_real(x: Number) -> Real:
     if isinstance(x, Real):
         return x
@@ -284,6 +700,32 @@ def ensure_real(x: Number) -> Real:
     raise TypeError()
 
 
+# folds the rational elements of xs into a single Fraction and returns it together with the remaining reals
+def split_rationals(xs: Iterable[Number], initial: Fraction,
+                    combine: Callable[[Fraction, Fraction], Fraction]) -> tuple[Fraction, list[Real]]:
+    total = initial
+    terms = []
+    for x in xs:
+        if isinstance(x, Real):
+            terms.append(x)
+        elif isinstance(x, int) or isinstance(x, Fraction) or isinstance(x, Decimal):
+            total = combine(total, Fraction(*x.as_integer_ratio()))
+        else:
+            raise_typeerror(x)
+    return total, terms
+
+
+# combines xs with the bihomographic operation given by coeffs in a balanced tree, so that every term of the result
+# passes through log2(len(xs)) nodes rather than len(xs) - 1
+def balanced(xs: list[Real], coeffs: tuple[int, int, int, int, int, int, int, int]) -> Real:
+    if len(xs) == 1:
+        return xs[0]
+
+    middle = len(xs) // 2
+    left, right = balanced(xs[:middle], coeffs), balanced(xs[middle:], coeffs)
+    return Real(reals._quadratic_computation.QuadraticComputation(left.compute(), right.compute(), coeffs))
+
+
 def raise_typeerror(other: Any) -> None:
     if other is float:
         raise TypeError('Mixing float with reals is not supported. Use Real.from_float if you want to convert '
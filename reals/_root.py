@@ -0,0 +1,174 @@
+from reals._real import Real
+from reals._computation import Computation
+from reals._monotone import MonotoneComputation
+
+import itertools
+import math
+from fractions import Fraction
+from typing import Generator
+
+
+# the continued fraction of sqrt(d) / q, whose complete quotients are (P + sqrt(d q^2)) / Q for integers P and Q; they
+# repeat after a pre-period of one term, and once a pair (P, Q) repeats, the period is replayed without any arithmetic
+#
+# the period can be as long as about sqrt(d q^2), so the pairs and terms are only kept for the first MAX_PERIOD_TERMS
+# terms, after which the terms are computed without looking for the period
+MAX_PERIOD_TERMS = 2**16
+
+
+def periodic_sqrt_terms(d: int, q: int) -> Generator[int, None, None]:
+    D = d * q * q
+    root = math.isqrt(D)
+    P, Q = 0, q * q
+    seen: dict[tuple[int, int], int] = {}
+    terms: list[int] = []
+    while len(terms) < MAX_PERIOD_TERMS:
+        if (P, Q) in seen:
+            yield from itertools.cycle(terms[seen[(P, Q)]:])
+        seen[(P, Q)] = len(terms)
+        a = (P + root) // Q
+        terms.append(a)
+        yield a
+        P = a * Q - P
+        Q = (D - P * P) // Q
+
+    del seen, terms
+    while True:
+        a = (P + root) // Q
+        yield a
+        P = a * Q - P
+        Q = (D - P * P) // Q
+
+
+# sqrt(p / q) = sqrt(p q) / q, which is rational if p q is a perfect square
+def sqrt_frac(f: Fraction) -> Real:
+    p, q = f.as_integer_ratio()
+    if p < 0:
+        raise ValueError(f'Expected a nonnegative number, got {f}')
+
+    root = math.isqrt(p * q)
+    if root * root == p * q:
+        return Real.from_fraction(Fraction(root, q))
+    return Real(periodic_sqrt_terms(p * q, q))
+
+
+# the continued fraction of the positive root of b y^n - a, computed with Lagrange's method: the integer part k of the
+# root is found by evaluating the polynomial at integers, and the polynomial is replaced by z^n P(k + 1/z), whose only
+# root greater than 1 is the tail of the continued fraction; a / b must not be an nth power, so the root is irrational
+class LagrangeComputation(Computation):
+    def __init__(self, f: Fraction, n: int) -> None:
+        a, b = f.as_integer_ratio()
+        # the coefficients of the polynomial, from the constant one up
+        self.coefficients = [-a] + [0] * (n - 1) + [b]
+        self.lower = 0
+
+    def __next__(self) -> int:
+        k = self.integer_part()
+
+        # the Taylor shift P(y + k), followed by reversing the coefficients
+        c = self.coefficients
+        for i in range(0, len(c) - 1):
+            for j in range(len(c) - 2, i - 1, -1):
+                c[j] += k * c[j + 1]
+        c.reverse()
+
+        self.lower = 1
+        return k
+
+    def coefficient_bits(self) -> int:
+        return max(coefficient.bit_length() for coefficient in self.coefficients)
+
+    # the largest integer below the root, found by doubling and bisection from the last known lower bound
+    def integer_part(self) -> int:
+        low, high = self.lower, self.lower + 1
+        while self.is_below(high):
+            low, high = high, 2 * high
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self.is_below(middle):
+                low = middle
+            else:
+                high = middle
+        return low
+
+    # the polynomial has a single root above self.lower, and its sign above the root is the sign of the leading
+    # coefficient
+    def is_below(self, t: int) -> bool:
+        value = 0
+        for coefficient in reversed(self.coefficients):
+            value = value * t + coefficient
+        return (value < 0) == (self.coefficients[-1] > 0)
+
+
+def root_frac(f: Fraction, n: int) -> Real:
+    if f < 0:
+        if n % 2 == 0:
+            raise ValueError(f'Expected a nonnegative number, got {f}')
+        return -root_frac(-f, n)
+    if n == 1:
+        return Real.from_fraction(f)
+    if n == 2:
+        return sqrt_frac(f)
+
+    a, b = f.as_integer_ratio()
+    root_a, root_b = integer_root(a, n), integer_root(b, n)
+    if root_a**n == a and root_b**n == b:
+        return Real.from_fraction(Fraction(root_a, root_b))
+    return Real(LagrangeComputation(f, n))
+
+
+# the largest integer whose nth power is at most a, with Newton's method from above
+def integer_root(a: int, n: int) -> int:
+    if a < 2:
+        return a
+    x = 1 << -(-a.bit_length() // n)
+    while True:
+        y = ((n - 1) * x + a // x**(n - 1)) // n
+        if y >= x:
+            return x
+        x = y
+
+
+# x^(1/n) is monotone, and for even n, the lower bound of a small positive x can be negative, in which case it is
+# replaced by 0, but x is negative if its upper bound is
+#
+# the bounds of x are multiples of 2^-bits, see MonotoneComputation, and their roots are bounded by integer roots at
+# the same precision, plus as many bits as the root is flatter than x, which is much faster than the continued
+# fraction of the root of a rational with large numbers
+class RootComputation(MonotoneComputation):
+    def __init__(self, x: Real, n: int):
+        self.n = n
+        super().__init__(x, self.root_bound)
+
+    def root_bound(self, f: Fraction) -> Real:
+        if self.n % 2 == 0:
+            f = max(f, Fraction(0))
+        return root_frac(f, self.n)
+
+    def bound_value(self, bound: Fraction, upward: bool) -> Fraction:
+        if self.n % 2 == 0:
+            bound = max(bound, Fraction(0))
+        p, q = bound.as_integer_ratio()
+        bits = self.bits + max(0, (abs(p) // q).bit_length() * (self.n - 1) // self.n)
+        # bound 2^(n bits) is an integer, since q divides 2^self.bits
+        return Fraction(rounded_root(p * (1 << (self.n * bits)) // q, self.n, upward), 1 << bits)
+
+    def refine(self) -> None:
+        super().refine()
+        upper = self.approximation.upper_bound_ratio()
+        if self.n % 2 == 0 and upper is not None and upper[0] < 0:
+            raise ValueError(f'Expected a nonnegative number, got an upper bound of {Fraction(*upper)}')
+
+
+# the nth root of a, rounded down or up
+def rounded_root(a: int, n: int, upward: bool) -> int:
+    if a < 0:
+        return -rounded_root(-a, n, not upward)
+    r = integer_root(a, n)
+    return r + 1 if upward and r**n != a else r
+
+
+def root(x: Real, n: int) -> Real:
+    if n == 1:
+        return x
+    return Real(RootComputation(x, n))
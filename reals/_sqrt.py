@@ -1,11 +1,19 @@
 from reals._real import Real
+from reals._plan import planned
+from reals._root import sqrt_frac, root
 
 from fractions import Fraction
 from decimal import Decimal
 from typing import Union
 
 
+@planned
 def sqrt(x: Union[Real, Fraction, int, Decimal]) -> Real:
-    if not (isinstance(x, Real) or isinstance(x, Fraction) or isinstance(x, int) or isinstance(x, Decimal)):
-        raise TypeError()
-    return Real.from_number(x).__pow__(Fraction(1, 2))
+    if isinstance(x, int) or isinstance(x, Fraction) or isinstance(x, Decimal):
+        p, q = x.as_integer_ratio()
+        return sqrt_frac(Fraction(p, q))
+
+    if isinstance(x, Real):
+        return root(x, 2)
+
+    raise TypeError()
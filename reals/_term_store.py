@@ -0,0 +1,144 @@
+import reals._term
+
+import sys
+import threading
+from array import array
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+
+# values that don't fit in a signed 64-bit slot are replaced by this marker and kept in a side table
+LARGE = -2**63
+MAX_SMALL = 2**63 - 1
+
+INITIAL_CAPACITY = 16
+
+
+class TermStore:
+    def __init__(self) -> None:
+        self.ns: Union[array, memoryview] = array('q')
+        self.ms: Optional[Union[array, memoryview]] = None  # only allocated once the first generalized term is appended
+        self.large_ns: dict[int, int] = {}
+        self.large_ms: dict[int, int] = {}
+        # the number of terms of the iterator that are still to be skipped because they were attached
+        self.skip = 0
+        # starts a generator after the attached terms, given these terms, and the generator it started
+        self.resume: Optional[Callable[[Iterable[reals._term.Term]], Iterator[reals._term.Term]]] = None
+        self.resumed: Optional[Iterator[reals._term.Term]] = None
+        # the arrays are allocated ahead with room for more terms, and only the first length values are terms
+        self.length = 0
+        # held while the store is extended, so that threads that share it share a single producer; terms are read
+        # without it, see append
+        self.lock = threading.Lock()
+
+    # uses the terms in read-only buffers of signed 64-bit values, such as a memory-mapped file, which are only copied
+    # when a term is appended
+    #
+    # once more terms are needed, they come from the generator that resume starts after the attached terms; without
+    # it, the iterator that extends the store starts at the first term, so the attached terms only save the work as
+    # long as no more terms are needed, after which they are computed again, and checked against the attached ones
+    def attach(self, ns: memoryview, ms: Optional[memoryview],
+               resume: Optional[Callable[[Iterable[reals._term.Term]], Iterator[reals._term.Term]]] = None) -> None:
+        assert self.length == 0
+        self.ns, self.ms = ns, ms
+        self.skip = self.length = len(ns)
+        self.resume = resume
+
+    # appends the next term of the iterator that generates the terms
+    def extend(self, iterator: Iterator[reals._term.Term]) -> None:
+        if self.resume is not None:
+            self.resumed, self.resume, self.skip = self.resume(self), None, 0
+        if self.resumed is not None:
+            iterator = self.resumed
+
+        while self.skip > 0:
+            index = self.length - self.skip
+            term = next(iterator)
+            if reals._term.expand_term(term) != reals._term.expand_term(self[index]):
+                raise ValueError(f'Term {index} was computed as {term}, but {self[index]} was attached')
+            self.skip -= 1
+        self.append(next(iterator))
+
+    # a term (n, 1) is stored as the simple term n, since they represent the same value
+    #
+    # readers don't take the lock, so an array that may be read is never resized, which could move its values while
+    # they are read: when an array is full, the terms are copied into one twice as large, which replaces it; the term
+    # is written before the length is increased, so readers only see it once it's complete
+    def append(self, term: reals._term.Term) -> None:
+        index = self.length
+        ns, ms = self.ns, self.ms
+        if index == len(ns):
+            ns = grow(ns, index)
+            ms = grow(ms, index) if ms is not None else None
+
+        if isinstance(term, tuple) and term[1] != 1:
+            n, m = term
+            if ms is None:
+                ms = array('q', [1]) * len(ns)
+            ms[index] = pack(m, self.large_ms, index)
+        else:
+            n, _ = reals._term.expand_term(term)
+        ns[index] = pack(n, self.large_ns, index)
+
+        self.ns, self.ms = ns, ms
+        self.length = index + 1
+
+    def __getitem__(self, index: int) -> reals._term.Term:
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError('term index out of range')
+
+        n = self.ns[index]
+        if n == LARGE:
+            n = self.large_ns[index]
+
+        ms = self.ms
+        if ms is None:
+            return n
+
+        m = ms[index]
+        if m == 1:
+            return n
+        if m == LARGE:
+            m = self.large_ms[index]
+        return (n, m)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator[reals._term.Term]:
+        for index in range(0, self.length):
+            yield self[index]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (TermStore, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    # the number of bytes used to store the terms, including the side tables for large terms
+    @property
+    def nbytes(self) -> int:
+        size = self.ns.itemsize * self.length
+        if self.ms is not None:
+            size += self.ms.itemsize * self.length
+        size += sum(sys.getsizeof(value) for value in self.large_ns.values())
+        size += sum(sys.getsizeof(value) for value in self.large_ms.values())
+        return size
+
+    def __repr__(self) -> str:
+        return f'TermStore({list(self)})'
+
+
+# a copy of the first length values, with room for as many more; a value of 1 in the room is the m of a simple term
+def grow(values: Union[array, memoryview], length: int) -> array:
+    result = array('q')
+    result.frombytes(memoryview(values).cast('B')[:8 * length])
+    result.extend(array('q', [1]) * max(length, INITIAL_CAPACITY))
+    return result
+
+
+def pack(value: int, large_values: dict[int, int], index: int) -> int:
+    if LARGE < value <= MAX_SMALL:
+        return value
+    large_values[index] = value
+    return LARGE
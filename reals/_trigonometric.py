@@ -1,209 +1,255 @@
 from reals._real import Real, Number, ensure_real
+from reals._plan import planned
 from reals._constants import pi
-from reals._computation import Computation
 from reals.approximation import Approximation
-from reals._exponential import exp
+from reals._compare import Ratio, improve, is_narrower
+from reals._monotone import MonotoneComputation, bit_burst
+from reals._algebraic_computation import AlgebraicComputation
+from reals._quadratic_computation import QuadraticComputation
 
+import functools
+from decimal import Decimal
 from fractions import Fraction
+from typing import Optional
 
+# coefficients of QuadraticComputation for (x + y) / (1 - xy) and (x + y) / (1 + xy), which give tan(2a) and tanh(2a)
+# for x = y = tan(a) or x = y = tanh(a), and sinh(2a) and sin(2a) for x = y = tanh(a) or x = y = tan(a)
+TANGENT_SUM = (0, 1, 1, 0, -1, 0, 0, 1)
+HYPERBOLIC_TANGENT_SUM = (0, 1, 1, 0, 1, 0, 0, 1)
 
+# coefficients of QuadraticComputation for (1 - xy) / (1 + xy) and (1 + xy) / (1 - xy), which give cos(2a) and
+# cosh(2a) for x = y = tan(a) or x = y = tanh(a)
+COSINE = (-1, 0, 0, 1, 1, 0, 0, 1)
+HYPERBOLIC_COSINE = (1, 0, 0, 1, -1, 0, 0, 1)
+
+# sin and cos of rationals up to this magnitude are computed from tan(x / 2) directly, which is halved and doubled as
+# many times as x has bits, and larger ones are reduced by a multiple of pi / 2 first
+MAX_HALVED_ARGUMENT = 2**10
+
+# the number of truncations of bit bursts whose tangents are cached, see tangent_truncations
+BURST_TRUNCATIONS = 256
+
+
+@planned
 def sin(x: Number):
-    x = ensure_real(x)
-    return _sin(x)
+    f = as_fraction(x)
+    if f is not None and abs(f) <= MAX_HALVED_ARGUMENT:
+        return double_angle(tan_frac(f / 2), HYPERBOLIC_TANGENT_SUM)
+    return sine_of_quadrant(*reduce(x))
 
 
+@planned
 def sinh(x: Number):
-    x = ensure_real(x)
-    return (exp(x) - exp(-x)) / 2
+    return double_angle(tanh(half(x)), TANGENT_SUM)
 
 
+@planned
 def csc(x: Number):
-    x = ensure_real(x)
-    return 1 / _sin(x)
+    return 1 / sin(x)
 
 
+@planned
 def csch(x: Number):
-    x = ensure_real(x)
-    return 2 / (exp(x) - exp(-x))
+    return 1 / sinh(x)
 
 
+@planned
 def cos(x: Number):
-    x = ensure_real(x)
-    return _cos(x)
+    f = as_fraction(x)
+    if f is not None and abs(f) <= MAX_HALVED_ARGUMENT:
+        return double_angle(tan_frac(f / 2), COSINE)
+    half_reduced, k = reduce(x)
+    return sine_of_quadrant(half_reduced, k + 1)
 
 
+@planned
 def cosh(x: Number):
-    x = ensure_real(x)
-    return (exp(x) + exp(-x)) / 2
+    return double_angle(tanh(half(x)), HYPERBOLIC_COSINE)
 
 
+@planned
 def sec(x: Number):
-    x = ensure_real(x)
-    return 1 / _cos(x)
+    return 1 / cos(x)
 
 
+@planned
 def sech(x: Number):
-    x = ensure_real(x)
-    return 2 / (exp(x) + exp(-x))
+    return 1 / cosh(x)
 
 
+@planned
 def tan(x: Number) -> Real:
-    x = ensure_real(x)
-    return _sin(x) / _cos(x)
+    f = as_fraction(x)
+    if f is not None:
+        return tan_frac(f)
+    return Real(TangentComputation(ensure_real(x)))
 
 
-def tanh(x: Number):
-    x = ensure_real(x)
-    exponential = exp(2 * x)
-    return (exponential - 1) / (exponential + 1)
+@planned
+def tanh(x: Number) -> Real:
+    f = as_fraction(x)
+    if f is not None:
+        return tanh_frac(f)
+    return Real(HyperbolicTangentComputation(ensure_real(x)))
 
 
+@planned
 def cot(x: Number) -> Real:
-    x = ensure_real(x)
-    return _cos(x) / _sin(x)
-
-
-def coth(x: Number):
-    x = ensure_real(x)
-    exponential = exp(2 * x)
-    return (exponential + 1) / (exponential - 1)
-
-
-class SineComputation(Computation):
-    def __init__(self, x: Real) -> None:
-        self.terms = 0
-        self.n = 0
-        self.current_term = x
-        self.x2 = x * x
-        self.hi = self.next_term()
-        self.lo = self.hi + self.next_term()
-        self.lo_comp = self.lo.compute()
-        self.hi_comp = self.hi.compute()
-
-    def next_term(self):
-        term = self.current_term
-        self.n += 2
-        self.current_term = self.current_term * self.x2 / (self.n * (self.n + 1))
-        return term
-
-    def improve(self):
-        self.hi = self.lo + self.next_term()
-        self.lo = self.hi + self.next_term()
-        self.lo_comp = self.lo.compute()
-        self.hi_comp = self.hi.compute()
-        for _ in range(0, self.terms):
-            next(self.lo_comp)
-            next(self.hi_comp)
-
-    def __next__(self) -> tuple[int, int]:
-        while True:
-            n_lo = next(self.lo_comp)
-            n_hi = next(self.hi_comp)
-
-            if n_lo == n_hi:
-                self.terms += 1
-                return n_lo
-            else:
-                self.improve()
-
-
-# set n=1 for cosine, n=2 for sin/x
-class TrigComputation(Computation):
-    def __init__(self, n: int, x: Real) -> None:
-        self.terms = 0
-        self.n = n
-        self.current_term = Real.from_int(1)
-        self.x2 = -x * x
-        self.lo = self.next_term()
-        self.hi = self.lo + self.next_term()
-        self.lo_comp = self.lo.compute()
-        self.hi_comp = self.hi.compute()
-
-    def next_term(self):
-        term = self.current_term
-        self.current_term = self.current_term * self.x2 / (self.n * (self.n + 1))
-        self.n += 2
-        return term
-
-    def improve(self):
-        self.lo = self.hi + self.next_term()
-        self.hi = self.lo + self.next_term()
-        self.lo_comp = self.lo.compute()
-        self.hi_comp = self.hi.compute()
-        for _ in range(0, self.terms):
-            next(self.lo_comp)
-            next(self.hi_comp)
-
-    def __next__(self) -> tuple[int, int]:
-        while True:
-            n_lo = next(self.lo_comp)
-            n_hi = next(self.hi_comp)
-
-            if n_lo == n_hi:
-                self.terms += 1
-                return n_lo
-            else:
-                self.improve()
-
-
-# reduce to [-pi, pi] (plus or minus epsilon)
-def reduce(x: Real) -> Real:
-    a = Approximation(x / (pi * 2) + Fraction(1, 2))
-    epsilon = Fraction(1, 1000)
-    a.improve_epsilon(epsilon)
-    frac = a.as_fraction()
-    assert frac
-    p, q = frac.as_integer_ratio()
-    return x - pi * 2 * (p // q)
-
-
-def _sin(x: Real) -> Real:
-    xr = reduce(x)
-    a = Approximation(2 * xr / pi + Fraction(1, 2))
-    epsilon = Fraction(1, 1000)
-    a.improve_epsilon(epsilon)
-    frac = a.as_fraction()
-    assert frac
-    p, q = frac.as_integer_ratio()
-    n = p // q
-    if n == -2:
-        return -_sin2(pi + xr)
-    if n == -1:
-        return -_cos2(xr + pi / 2)
-    if n == 0:
-        return _sin2(xr)
-    if n == 1:
-        return _cos2(xr - pi / 2)
-    if n == 2:
-        return _sin2(pi - xr)
-    raise Exception()
-
-
-def _cos(x: Real) -> Real:
-    xr = reduce(x)
-    a = Approximation(2 * xr / pi + Fraction(1, 2))
-    epsilon = Fraction(1, 1000)
-    a.improve_epsilon(epsilon)
-    frac = a.as_fraction()
-    assert frac
-    p, q = frac.as_integer_ratio()
-    n = p // q
-    if n == -2:
-        return -_cos2(xr + pi)
-    if n == -1:
-        return _sin2(pi / 2 + xr)
-    if n == 0:
-        return _cos2(xr)
-    if n == 1:
-        return _sin2(pi / 2 - xr)
-    if n == 2:
-        return -_cos2(xr - pi)
-    raise Exception()
-
-
-def _sin2(x: Real) -> Real:
-    return x * Real(TrigComputation(2, x))
-
-
-def _cos2(x: Real) -> Real:
-    return Real(TrigComputation(1, x))
+    return 1 / tan(x)
+
+
+@planned
+def coth(x: Number) -> Real:
+    return 1 / tanh(x)
+
+
+# returns None if x is a Real
+def as_fraction(x: Number) -> Optional[Fraction]:
+    if isinstance(x, int) or isinstance(x, Fraction) or isinstance(x, Decimal):
+        p, q = x.as_integer_ratio()
+        return Fraction(p, q)
+    return None
+
+
+def half(x: Number) -> Number:
+    f = as_fraction(x)
+    return f / 2 if f is not None else ensure_real(x) / 2
+
+
+# Lambert's continued fraction tan(p / q) = p / (q - p^2 / (3q - p^2 / (5q - ...))), or the one for tanh(p / q), which
+# has p^2 instead of -p^2; the tails are about (2k + 1) q, so they are divided by q to make them at least 1 (when
+# |p / q| <= 1) without making the ingested expressions cross a pole, which means that every ingestion replaces the
+# tail v by ((2k + 1) q^2 v + m) / (q^2 v) with m = -p^2 or m = p^2 instead of ingesting a continued fraction term
+class LambertComputation(AlgebraicComputation):
+    def __init__(self, f: Fraction, sign: int) -> None:
+        p, q = f.as_integer_ratio()
+        self.m = sign * p * p
+        self.q_squared = q * q
+        self.n = 3 * self.q_squared
+        super().__init__(iter([]), (p * q, 0, self.q_squared, self.m))
+
+    def ingest_x(self) -> None:
+        state = self.state
+        state.a, state.b = self.n * state.a + self.q_squared * state.b, self.m * state.a
+        state.c, state.d = self.n * state.c + self.q_squared * state.d, self.m * state.c
+        self.n += 2 * self.q_squared
+
+
+def lambert(f: Fraction, sign: int) -> Real:
+    if f == 0:
+        return Real.from_int(0)
+    return Real(LambertComputation(f, sign))
+
+
+# the continued fractions are only used for |f| <= 1; for larger arguments, f is halved until it is, and the result
+# is doubled as often using the double-angle formulas
+def tan_frac(f: Fraction) -> Real:
+    return halve_and_double(f, -1, TANGENT_SUM)
+
+
+def tanh_frac(f: Fraction) -> Real:
+    return halve_and_double(f, 1, HYPERBOLIC_TANGENT_SUM)
+
+
+def halve_and_double(f: Fraction, sign: int, coeffs: tuple[int, int, int, int, int, int, int, int]) -> Real:
+    halvings = 0
+    while abs(f) > 1:
+        f /= 2
+        halvings += 1
+
+    result = lambert(f, sign)
+    for _ in range(0, halvings):
+        result = double_angle(result, coeffs)
+    return result
+
+
+def double_angle(t: Real, coeffs: tuple[int, int, int, int, int, int, int, int]) -> Real:
+    return Real(QuadraticComputation(t.compute(), t.compute(), coeffs))
+
+
+# the tangent of the last truncation of a bit burst, from the tangent of the one before and the tangent of their
+# difference, which is small; the bounds of a real argument share all but their last few truncations
+@functools.lru_cache(maxsize=BURST_TRUNCATIONS)
+def tangent_truncations(truncations: tuple[Fraction, ...], sign: int) -> Real:
+    if len(truncations) == 1:
+        return tan_frac(truncations[0]) if sign < 0 else tanh_frac(truncations[0])
+    previous = tangent_truncations(truncations[:-1], sign)
+    difference = lambert(truncations[-1] - truncations[-2], sign)
+    coeffs = TANGENT_SUM if sign < 0 else HYPERBOLIC_TANGENT_SUM
+    return Real(QuadraticComputation(previous.compute(), difference.compute(), coeffs))
+
+
+def tan_split(f: Fraction) -> Real:
+    return tangent_truncations(bit_burst(f), -1)
+
+
+def tanh_split(f: Fraction) -> Real:
+    return tangent_truncations(bit_burst(f), 1)
+
+
+# tan is monotone between its poles, and tanh is monotone everywhere
+class TangentComputation(MonotoneComputation):
+    def __init__(self, x: Real):
+        super().__init__(x, tan_split)
+
+
+class HyperbolicTangentComputation(MonotoneComputation):
+    def __init__(self, x: Real):
+        super().__init__(x, tanh_split)
+
+
+# sin and cos of other arguments are reduced to r = x - k pi / 2, with k the integer closest to x / (pi / 2), and
+# computed from tan(r / 2), where |r / 2| < pi / 4 is far from the poles of tan; depending on k mod 4, sin(x) is
+# 2t / (1 + t^2), (1 - t^2) / (1 + t^2), or one of their negations, for t = tan(r / 2)
+QUADRANTS = (HYPERBOLIC_TANGENT_SUM, COSINE, (0, -1, -1, 0, 1, 0, 0, 1), (1, 0, 0, -1, 1, 0, 0, 1))
+
+# the multiples of pi / 4 that are subtracted from x / 2 are cached, so that they compute the digits of pi only once
+QUARTER_PI_MULTIPLES = 64
+
+
+def sine_of_quadrant(half_reduced: Real, k: int) -> Real:
+    return double_angle(tan(half_reduced), QUADRANTS[k % 4])
+
+
+# returns r / 2 and k
+def reduce(x: Number) -> tuple[Real, int]:
+    k = quadrant(x)
+    half_x = ensure_real(half(x))
+    if k == 0:
+        return half_x, 0
+    return half_x - quarter_pi_multiple(k), k
+
+
+@functools.lru_cache(maxsize=QUARTER_PI_MULTIPLES)
+def quarter_pi_multiple(k: int) -> Real:
+    return quarter_pi() * k
+
+
+# built on first use rather than when the module is imported
+@functools.cache
+def quarter_pi() -> Real:
+    return pi / 4
+
+
+# an integer within 0.62 of x / (pi / 2), using the shared approximations of x and pi; x is refined to an error of
+# 1/8, and pi to an error of 1 / (8 (|x| + 1)), so that large arguments use as many digits of pi as they need
+def quadrant(x: Number) -> int:
+    f = as_fraction(x)
+    if f is not None:
+        lower = f.as_integer_ratio()
+        magnitude = abs(f)
+    else:
+        lower, upper = narrow_bounds(ensure_real(x).approximation(), Fraction(1, 8))
+        magnitude = max(abs(Fraction(*lower)), abs(Fraction(*upper)))
+
+    pi_lower, _ = narrow_bounds(pi.approximation(), 1 / (8 * (magnitude + 1)))
+    (p, q), (a, b) = lower, pi_lower
+    return round(Fraction(2 * p * b, q * a))
+
+
+def narrow_bounds(approximation: Approximation, epsilon: Fraction) -> tuple[Ratio, Ratio]:
+    while True:
+        lower, upper = approximation.lower_bound_ratio(), approximation.upper_bound_ratio()
+        if lower is not None and upper is not None and is_narrower(lower, upper, epsilon):
+            return lower, upper
+        improve(approximation)
@@ -1,62 +1,85 @@
+from __future__ import annotations
+
 import reals._real
+import reals._budget
 import reals._homographic
+import reals._term
 import reals._computation
 
+import itertools
+import threading
+import contextlib
+
 from fractions import Fraction
-from typing import Optional, Union
+from typing import Iterator, Optional, Union
 
 
 class Approximation:
     def __init__(self, x: Union[reals._real.Real, reals._computation.Computation]):
         self.ingestions = 0
         self.state = reals._homographic.Homographic(1, 0, 0, 1)
+        # a real shares its approximation between threads, which must not see the state halfway through an update
+        self.lock = threading.RLock()
         if isinstance(x, reals._real.Real):
             self.computation = x.compute()
         else:
             self.computation = x
 
+    # the terms are multiplied in a balanced tree before they are ingested, so that most of the work is done by
+    # multiplying numbers of similar size, which is much faster than ingesting large numbers of terms one by one
+    #
+    # when computing a term raises an exception, such as an exceeded budget, the terms that were taken are ingested
+    # anyway, since the computation doesn't return them again
     def improve(self, n: int = 1) -> None:
-        for _ in range(0, n):
+        with self.lock:
+            terms: list[reals._term.Term] = []
             try:
+                for term in itertools.islice(self.computation, n):
+                    terms.append(term)
+            finally:
+                self.ingestions += len(terms)
+                if terms:
+                    self.state.compose(term_product(terms, 0, len(terms)))
+            if len(terms) < n:
                 self.ingestions += 1
-                next_term = next(self.computation)
-                self.state.ingest(next_term)
-            except StopIteration:
                 self.state.ingest_inf()
-                break
 
     def improve_epsilon(self, epsilon: Fraction) -> None:
-        while not (eps := self.epsilon_fraction()) or eps > epsilon:
-            try:
+        with self.lock, self.interval_on_budget_exceeded():
+            while not (eps := self.epsilon_fraction()) or eps > epsilon:
+                try:
+                    next_term = next(self.computation)
+                except StopIteration:
+                    self.ingestions += 1
+                    self.state.ingest_inf()
+                    assert self.epsilon_fraction() == 0
+                    break
                 self.ingestions += 1
-                next_term = next(self.computation)
                 self.state.ingest(next_term)
-            except StopIteration:
-                self.state.ingest_inf()
-                assert self.epsilon_fraction() == 0
-                break
 
     def as_fraction(self) -> Optional[Fraction]:
-        if self.state.c != 0:
-            return Fraction(self.state.a, self.state.c)
-        return None
+        with self.lock:
+            a, c = self.state.a, self.state.c
+        return Fraction(a, c) if c != 0 else None
 
     def as_float(self) -> Optional[float]:
-        if self.state.c != 0:
-            return self.state.a / self.state.c
-        return None
+        with self.lock:
+            a, c = self.state.a, self.state.c
+        return a / c if c != 0 else None
 
     def _lower(self) -> tuple[int, int]:
-        if self.ingestions % 2 == 1:
-            return (self.state.a, self.state.c)
-        else:
-            return (self.state.a + self.state.b, self.state.c + self.state.d)
+        with self.lock:
+            if self.ingestions % 2 == 1:
+                return (self.state.a, self.state.c)
+            else:
+                return (self.state.a + self.state.b, self.state.c + self.state.d)
 
     def _upper(self) -> tuple[int, int]:
-        if self.ingestions % 2 == 1:
-            return (self.state.a + self.state.b, self.state.c + self.state.d)
-        else:
-            return (self.state.a, self.state.c)
+        with self.lock:
+            if self.ingestions % 2 == 1:
+                return (self.state.a + self.state.b, self.state.c + self.state.d)
+            else:
+                return (self.state.a, self.state.c)
 
     def lower_bound_fraction(self) -> Optional[Fraction]:
         if self.ingestions == 0:
@@ -74,6 +97,15 @@ class Approximation:
         p, q = self._upper()
         return Fraction(p, q) if q != 0 else None
 
+    # the bounds as a pair (p, q) with q > 0, which avoids normalizing a Fraction
+    def lower_bound_ratio(self) -> Optional[tuple[int, int]]:
+        if self.ingestions == 0:
+            return None
+        return positive_denominator(*self._lower())
+
+    def upper_bound_ratio(self) -> Optional[tuple[int, int]]:
+        return positive_denominator(*self._upper())
+
     def upper_bound_float(self) -> Optional[float]:
         p, q = self._upper()
         return p / q if q != 0 else None
@@ -97,12 +129,40 @@ class Approximation:
         return None
 
     def closest_float(self) -> float:
-        while not (lo := self.lower_bound_float()) or not (hi := self.upper_bound_float()) or lo != hi:
-            self.improve()
+        with self.lock, self.interval_on_budget_exceeded():
+            while not (lo := self.lower_bound_float()) or not (hi := self.upper_bound_float()) or lo != hi:
+                self.improve()
 
         assert lo
         return lo
 
+    # reports the interval of the approximation when a budget runs out
+    @contextlib.contextmanager
+    def interval_on_budget_exceeded(self) -> Iterator[None]:
+        try:
+            yield
+        except reals._budget.BudgetExceeded as exceeded:
+            exceeded.interval = self.interval_fraction()
+            raise
+
+
+# the product of the matrices [[n, m], [1, 0]] of the terms (n, m) in terms[start:end], as a tuple (a, b, c, d)
+def term_product(terms: list[reals._term.Term], start: int, end: int) -> tuple[int, int, int, int]:
+    if end - start == 1:
+        n, m = reals._term.expand_term(terms[start])
+        return (n, m, 1, 0)
+
+    middle = (start + end) // 2
+    a1, b1, c1, d1 = term_product(terms, start, middle)
+    a2, b2, c2, d2 = term_product(terms, middle, end)
+    return (a1 * a2 + b1 * c2, a1 * b2 + b1 * d2, c1 * a2 + d1 * c2, c1 * b2 + d1 * d2)
+
+
+def positive_denominator(p: int, q: int) -> Optional[tuple[int, int]]:
+    if q == 0:
+        return None
+    return (p, q) if q > 0 else (-p, -q)
+
 
 def closest_float(x: reals._real.Real) -> float:
     return Approximation(x).closest_float()
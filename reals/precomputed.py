@@ -0,0 +1,125 @@
+import reals._real
+import reals._term
+import reals._constants
+import reals._pi
+
+import itertools
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+
+# the terms of the constants can be written to a file once, and memory-mapped by every process that uses them, so
+# that the processes share a single copy; the file is laid out as
+#
+#   header:   magic, version, number of sections
+#   sections: name, offset, number of terms, whether there are denominators, CRC-32 of the data
+#   CRC-32 of the header and the sections
+#   data:     for each section, the numerators and optionally the denominators of the terms, as signed 64-bit values
+#
+# all values are little-endian, and the data of every section is aligned to 8 bytes; a constant whose terms outgrow
+# 64 bits is stored up to the first such term, after which its generator takes over
+#
+# the generators in RESUMABLE continue after the stored terms; the other constants have generators that are cheap
+# enough to start over at the first term when more terms are needed than the file has, and the terms they compute
+# again are checked against the file
+MAGIC = b'REALSTRM'
+VERSION = 1
+HEADER = struct.Struct('<8sII')
+SECTION = struct.Struct('<16sQQII')
+CHECKSUM = struct.Struct('<I')
+
+CONSTANTS = {'pi': reals._constants.pi, 'e': reals._constants.e, 'log2': reals._constants.log2,
+             'phi': reals._constants.phi}
+
+RESUMABLE = {'pi': reals._pi.pi_term_generator}
+
+DEFAULT_TERMS = 20000
+
+MAX_VALUE = 2**63 - 1
+
+
+def write(path: str, terms: int = DEFAULT_TERMS) -> None:
+    sections = []
+    for name, constant in CONSTANTS.items():
+        ns, ms = array('q'), array('q')
+        for term in itertools.islice(constant.compute(), terms):
+            n, m = reals._term.expand_term(term)
+            if not (-MAX_VALUE <= n <= MAX_VALUE and -MAX_VALUE <= m <= MAX_VALUE):
+                break
+            ns.append(n)
+            ms.append(m)
+        has_ms = any(m != 1 for m in ms)
+        if sys.byteorder == 'big':
+            ns.byteswap()
+            ms.byteswap()
+        data = ns.tobytes() + (ms.tobytes() if has_ms else b'')
+        sections.append((name, len(ns), has_ms, data))
+
+    offset = HEADER.size + SECTION.size * len(sections) + CHECKSUM.size
+    offset += -offset % 8
+
+    header = HEADER.pack(MAGIC, VERSION, len(sections))
+    for name, count, has_ms, data in sections:
+        header += SECTION.pack(name.encode(), offset, count, has_ms, zlib.crc32(data))
+        offset += len(data)
+    header += CHECKSUM.pack(zlib.crc32(header))
+
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(b'\0' * (-len(header) % 8))
+        for _, _, _, data in sections:
+            f.write(data)
+
+
+# memory-maps the file and attaches its terms to the constants that haven't computed any terms yet, which read them
+# lazily and extend them with their generators when they need more; returns the names of the attached constants
+def load(path: str) -> list[str]:
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(buffer)
+
+    if len(view) < HEADER.size:
+        raise ValueError(f'{path} is not a file of precomputed terms')
+    magic, version, count = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError(f'{path} is not a file of precomputed terms')
+    if version != VERSION:
+        raise ValueError(f'Expected version {VERSION} of precomputed terms, got {version}')
+
+    header_size = HEADER.size + SECTION.size * count
+    if len(view) < header_size + CHECKSUM.size:
+        raise ValueError(f'{path} is truncated')
+    (checksum,) = CHECKSUM.unpack_from(view, header_size)
+    if zlib.crc32(view[:header_size]) != checksum:
+        raise ValueError(f'The header of {path} is corrupted')
+
+    attached = []
+    for i in range(0, count):
+        name_bytes, offset, terms, has_ms, checksum = SECTION.unpack_from(view, HEADER.size + SECTION.size * i)
+        name = name_bytes.rstrip(b'\0').decode()
+        size = 8 * terms * (2 if has_ms else 1)
+        data = view[offset:offset + size]
+        if len(data) != size or zlib.crc32(data) != checksum:
+            raise ValueError(f'The terms of {name} in {path} are corrupted')
+
+        constant = CONSTANTS.get(name)
+        if constant is None or len(constant.cache) > 0 or terms == 0:
+            continue
+
+        ns = native(data[:8 * terms])
+        ms = native(data[8 * terms:]) if has_ms else None
+        constant.cache.attach(ns, ms, RESUMABLE.get(name))
+        attached.append(name)
+
+    return attached
+
+
+# a view of little-endian signed 64-bit values, which is only copied on big-endian machines
+def native(data: memoryview) -> memoryview:
+    if sys.byteorder == 'big':
+        values = array('q', data.tobytes())
+        values.byteswap()
+        return memoryview(values)
+    return data.cast('q')
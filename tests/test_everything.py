@@ -1,12 +1,35 @@
-from reals import Real, sqrt, e, pi
+from reals import Real, sqrt, exp, log, sin, cos, tan, tanh, e, phi, pi
 from reals.approximation import Approximation, best_rational_approximations
 
 from reals._real import CachedComputation
+from reals._compare import compare
+from reals._term import Term
+from reals._term_store import TermStore
+from reals._radix import to_digits
 from reals._algebraic_computation import AlgebraicComputation
 from reals._quadratic_computation import QuadraticComputation
+from reals._homographic import Homographic
+from reals._monotone import MonotoneComputation
+import reals._budget
+import reals._profile
+import reals._root
+import reals._pi
+import reals._constants
+import reals.precomputed
 
 import pytest
+import asyncio
+import pickle
+import weakref
+import gc
+import itertools
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from array import array
+from pathlib import Path
 from typing import Generator
+from decimal import Decimal
 from fractions import Fraction
 
 
@@ -33,6 +56,75 @@ def test_real_cache_is_shared() -> None:
     assert c2.index == 1
 
 
+def test_term_store() -> None:
+    store = TermStore()
+    terms: list[Term] = [3, -7, 2**70, (1, 4), (-2**80, 3), (5, 2**90), 0, (6, 1)]
+    for term in terms:
+        store.append(term)
+
+    assert len(store) == len(terms)
+    assert list(store) == terms[:-1] + [6]
+    assert store[-1] == 6
+    assert store.nbytes >= 2 * 8 * len(terms)
+
+
+def test_attached_terms_are_skipped() -> None:
+    store = TermStore()
+    store.attach(memoryview(array('q', [3, 7, 15])), None)
+    assert list(CachedComputation(iter([3, 7, 15, 1, 292]), store)) == [3, 7, 15, 1, 292]
+    assert isinstance(store.ns, array)
+
+    store = TermStore()
+    store.attach(memoryview(array('q', [3, 7, 16])), None)
+    with pytest.raises(ValueError):
+        list(CachedComputation(iter([3, 7, 15, 1, 292]), store))
+
+    store = TermStore()
+    store.attach(memoryview(array('q', [3, 7, 15])), None, lambda terms: iter([len(list(terms)), 292]))
+    assert list(CachedComputation(iter([]), store)) == [3, 7, 15, 3, 292]
+
+
+def test_precomputed_terms(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = str(tmp_path / 'terms.bin')
+    reals.precomputed.write(path, 100)
+
+    # the terms are attached to fresh constants, since the shared ones may have computed terms already
+    constants = {'pi': Real(reals._pi.pi_term_generator()), 'e': Real(reals._constants.e_term_generator())}
+    monkeypatch.setattr(reals.precomputed, 'CONSTANTS', constants)
+    assert reals.precomputed.load(path) == ['pi', 'e']
+    assert constants['pi'].evaluate(300) == pi.evaluate(300)
+    assert constants['e'].evaluate(300) == e.evaluate(300)
+
+    # on a big-endian machine the values are swapped to little-endian, and the terms still have no denominators
+    native, swapped = tmp_path / 'native.bin', tmp_path / 'swapped.bin'
+    reals.precomputed.write(str(native), 100)
+    with monkeypatch.context() as context:
+        context.setattr(sys, 'byteorder', 'big')
+        reals.precomputed.write(str(swapped), 100)
+        constants = {'pi': Real(reals._pi.pi_term_generator()), 'e': Real(reals._constants.e_term_generator())}
+        monkeypatch.setattr(reals.precomputed, 'CONSTANTS', constants)
+        assert reals.precomputed.load(str(swapped)) == ['pi', 'e']
+        assert constants['pi'].evaluate(300) == pi.evaluate(300)
+    assert swapped.stat().st_size == native.stat().st_size
+
+    data = bytearray(Path(path).read_bytes())
+    data[-1] ^= 1
+    Path(path).write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        reals.precomputed.load(path)
+
+
+# the modules of the standard library that make up most of the time of importing all of reals
+HEAVY_MODULES = ['asyncio', 'concurrent.futures', 'decimal', 'fractions', 'mmap', 'multiprocessing']
+
+
+def test_import_is_lazy() -> None:
+    code = ('import sys, reals; '
+            f'print(sorted(m for m in sys.modules if m.startswith("reals.") or m in {HEAVY_MODULES}))')
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
+
+
 MAX_ITERATIONS = 100
 
 
@@ -93,6 +185,171 @@ def test_terminating_quadratic_computation2() -> None:
         next(c)
 
 
+def test_scalar_operations_are_fused() -> None:
+    x = (3 * e + 1) / 7 - 2
+    assert isinstance(x.iterator, AlgebraicComputation)
+    assert isinstance(x.iterator.x, CachedComputation)
+    assert x.iterator.x.iterator is e.iterator
+    assert x.evaluate(30, round=False) == '-0.692164930660409184845591083706'
+
+
+def test_sum_and_prod() -> None:
+    assert Real.sum([e, pi, 1, Fraction(1, 3)]).evaluate(30) == (e + pi + Fraction(4, 3)).evaluate(30)
+    assert Real.prod([e, pi, 2, Fraction(1, 3)]).evaluate(30) == (e * pi * Fraction(2, 3)).evaluate(30)
+    assert Real.sum([e / k for k in range(1, 20)]).evaluate(20) == '9.64375624211719391091'
+    assert Real.sum([]).evaluate(3) == '0.000'
+    assert Real.prod([]).evaluate(3) == '1.000'
+
+
+def test_coefficients_are_reduced() -> None:
+    h = Homographic(6, 10, 4, 8)
+    assert h.reduce() == 3
+    assert (h.a, h.b, h.c, h.d) == (3, 5, 2, 4)
+
+    x = exp(Fraction(3, 5))
+    x.evaluate(1000, round=False)
+    assert isinstance(x.iterator, AlgebraicComputation)
+    assert 0 < x.iterator.max_coefficient_bits < 400
+
+    # the maximum covers the size of the coefficients whenever a term is taken from an input, which is right after the
+    # previous term was ingested, and before the coefficients are reduced
+    sizes = []
+
+    def sampled(x: Real) -> Generator[Term, None, None]:
+        for term in x.compute():
+            sizes.append(y.state.bit_length())
+            yield term
+
+    y = QuadraticComputation(Real(sampled(e)).compute(), Real(sampled(pi)).compute(), (0, 1, 1, 0, 0, 0, 0, 1))
+    Real(y).evaluate(500)
+    assert max(sizes) <= y.max_coefficient_bits
+
+
+def test_iter_digits() -> None:
+    assert list(itertools.islice(e.iter_digits(), 6)) == ['2', '7', '1', '8', '2', '8']
+
+
+def test_digits_are_resumed() -> None:
+    x = pi * pi
+    first = x.evaluate(200, round=False)
+    cursor = x.digits()
+    second = x.evaluate(400, round=False)
+    assert x.digits() is cursor
+    assert second.startswith(first)
+    assert len(cursor.fraction) >= 400
+
+
+def test_rounding() -> None:
+    assert Real.from_fraction(Fraction(-126, 1000)).evaluate(2) == '-0.13'
+    assert Real.from_fraction(Fraction(-124, 1000)).evaluate(2) == '-0.12'
+    assert Real.from_fraction(Fraction(-99996, 10000)).evaluate(3) == '-10.000'
+    assert Real.from_fraction(Fraction(5, 2)).evaluate(0) == '3.'
+    assert e.evaluate(3) == '2.718'
+
+
+# the digits of a number on a digit boundary are never determined, so it is rounded from its rational enclosure
+def test_rounding_exact_values() -> None:
+    x = Real(sqrt2_gen())
+    assert (pi - pi).evaluate(5) == '0.00000'
+    assert (e / e).evaluate(5) == '1.00000'
+    assert (x * x).evaluate(5) == '2.00000'
+    assert (sin(x) * sin(x) + cos(x) * cos(x)).evaluate(5) == '1.00000'
+    assert cos(pi / 3).evaluate(5) == '0.50000'
+    assert (pi - pi - Fraction(1, 2)).evaluate(0) == '-1.'
+    assert (pi / pi / 2).evaluate(0, base=2) == '1.'
+    assert (e - e + Fraction(1, 2)).evaluate(1, base=3) == '0.2'
+    assert (e - e - 3).evaluate(5, base=7) == '-3.00000'
+
+
+def test_fixed_point_digits() -> None:
+    x = Real(sqrt2_gen()) - 3
+    long = x.evaluate(5000)
+    short = (Real(sqrt2_gen()) - 3).evaluate(1000)
+    assert long.startswith(short[:-1]) and long.startswith('-1.585786437626904951198')
+    assert ''.join(itertools.islice(x.iter_digits(), 5100)).startswith(long[:-1].replace('.', ''))
+
+    assert Real.from_fraction(Fraction(-126, 1000)).evaluate(3000, round=False) == '-0.126' + '0' * 2997
+    assert to_digits(7**4000, 3400) == str(7**4000).zfill(3400)
+
+
+def test_arbitrary_base() -> None:
+    assert pi.evaluate(20, base=16) == '3.243f6a8885a308d3131a'
+    assert e.evaluate(12, round=False, base=2) == '10.101101111110'
+    assert ''.join(itertools.islice((-e).iter_digits(base=36), 4)) == '-2puw'
+    assert Real.from_fraction(Fraction(-1, 2)).evaluate(1, base=3) == '-0.2'
+    assert Real.from_fraction(Fraction(1, 3)).evaluate(2, base=3) == '0.10'
+    assert (pi - 3).to_bytes(20) == bytes([0x24, 0x3f, 0x60])
+    assert Real.from_fraction(Fraction(3, 4)).to_bytes(3) == bytes([0xc0])
+    assert (Real(sqrt2_gen()) - 3).evaluate(4000, base=8).startswith('-1.45373031')
+
+    for x in (pi, -(pi - 3), Real.from_int(1)):
+        with pytest.raises(ValueError):
+            x.to_bytes(8)
+
+    with pytest.raises(ValueError):
+        pi.evaluate(5, base=37)
+
+
+def test_comparisons_share_refinement() -> None:
+    x = Real(sqrt2_gen())
+    assert x < Real.from_fraction(Fraction(99, 70)) and x > Real.from_fraction(Fraction(140, 99))
+    ingestions = x.approximation().ingestions
+    assert x < Real.from_fraction(Fraction(99, 70))
+    assert x.approximation().ingestions == ingestions
+
+    assert Real.from_fraction(Fraction(1, 3)) == Real.from_fraction(Fraction(1, 3))
+    assert x.to_float() == 2**0.5
+
+
+def test_monotone_bounds_are_rounded() -> None:
+    for f in (exp, log, tan):
+        x = f(Real(sqrt2_gen()))
+        x.evaluate(500)
+        assert isinstance(x.iterator, MonotoneComputation) and x.iterator.lower is not None
+        # 500 digits take 1661 bits, and the refinements double the number of terms of the argument
+        assert 1661 < x.iterator.bits < 4 * 1661
+        assert x.iterator.lower.bound[1] == 1 << x.iterator.bits
+
+
+def test_lambert_continued_fractions() -> None:
+    assert tan(Fraction(7, 3)).evaluate(30) == '-1.046800377915422333055465155667'
+    x = tan(Real(sqrt2_gen()))
+    assert x.evaluate(30) == '6.334119167042191554056833264228'
+    assert isinstance(x.iterator, MonotoneComputation)
+    assert tanh(-Real(sqrt2_gen())).evaluate(30) == '-0.888385561585660544953000305728'
+    assert tan(0).evaluate(3) == '0.000'
+
+
+# the bounds of tan(pi) have the terms -1 and 0 however close they get, so generalized terms are emitted
+def test_monotone_functions_on_term_boundaries() -> None:
+    x = tan(pi)
+    assert (x + Fraction(1, 3)).evaluate(5) == '0.33333'
+    assert isinstance(x.iterator, MonotoneComputation) and x.iterator.non_simple_entries > 0
+    assert (tan(pi / 4) + Fraction(1, 3)).evaluate(5) == '1.33333'
+    assert (tanh(e - e) - Fraction(1, 3)).evaluate(5) == '-0.33333'
+
+
+def test_trigonometric_argument_reduction() -> None:
+    assert sin(10**30).evaluate(30) == '-0.090116901912138058030386428953'
+    assert cos(Real(sqrt2_gen()) * 100).evaluate(30) == '-0.998765863604859194216289853608'
+    assert cos(-Real(sqrt2_gen())).evaluate(30) == '0.155943694765374473454647978909'
+
+
+# the reduced argument of a multiple of pi / 2 is exactly 0, whose tangent is on the boundary between two terms
+def test_trigonometric_multiples_of_half_pi() -> None:
+    assert (sin(pi) + Fraction(1, 3)).evaluate(5) == '0.33333'
+    assert (cos(pi / 2) + Fraction(1, 3)).evaluate(5) == '0.33333'
+    assert (cos(3 * pi / 2) - Fraction(1, 3)).evaluate(5) == '-0.33333'
+    assert (sin(-pi) + Real(sqrt2_gen())).evaluate(5) == '1.41421'
+    assert (sin(2 * pi) * e + 1).evaluate(5) == '1.00000'
+
+
+def test_chudnovsky_pi() -> None:
+    terms = [3, 7, 15, 1, 292, 1, 1, 1, 2, 1, 3, 1, 14, 2, 1, 1, 2, 2, 2, 2, 1, 84, 2, 1, 1, 15, 3, 13, 1, 4]
+    assert list(itertools.islice(pi.compute(), 30)) == terms
+    assert pi.evaluate(1000).endswith('2164201989')
+
+
 def test_termination() -> None:
     f = get_rational_from_real(Fraction(2, 1) * Real.from_fraction(Fraction(1, 10)))
     assert f == Fraction(1, 5)
@@ -123,6 +380,218 @@ def test_sqrt_of_square_fractions() -> None:
     assert x == Real.from_fraction(Fraction(4, 3))
 
 
+def test_periodic_sqrt(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert list(itertools.islice(sqrt(7).compute(), 9)) == [2, 1, 1, 1, 4, 1, 1, 1, 4]
+    monkeypatch.setattr(reals._root, 'MAX_PERIOD_TERMS', 3)
+    assert list(itertools.islice(reals._root.periodic_sqrt_terms(7, 1), 9)) == [2, 1, 1, 1, 4, 1, 1, 1, 4]
+    monkeypatch.undo()
+    assert sqrt(Fraction(7, 3)).evaluate(30) == '1.527525231651946668862682397909'
+    assert sqrt(Real(sqrt2_gen()) * 2).evaluate(30) == '1.681792830507429086062250952466'
+
+    with pytest.raises(ValueError):
+        sqrt(-2)
+    with pytest.raises(ValueError):
+        sqrt(pi - 4).evaluate(5)
+
+
+def test_integer_and_rational_powers() -> None:
+    assert (Real.from_int(-2)**3).evaluate(3) == '-8.000'
+    assert (Real(sqrt2_gen())**-3).evaluate(30) == '0.353553390593273762200422181052'
+    assert list(itertools.islice((Real.from_int(2)**Fraction(1, 3)).compute(), 10)) == [1, 3, 1, 5, 1, 1, 4, 1, 1, 8]
+    assert (Real.from_int(-8)**Fraction(1, 3)).evaluate(3) == '-2.000'
+    assert (-pi**Fraction(2, 3)).evaluate(30) == '-2.145029397111025600077444100941'
+
+    half = Real.from_fraction(Fraction(-1, 2))
+    assert (half**-1).evaluate(5) == '-2.00000'
+    assert (half**-2).evaluate(5) == '4.00000'
+    assert (half**-3).evaluate(5) == '-8.00000'
+    assert (Real.from_int(-2)**-1).evaluate(5) == '-0.50000'
+    assert ((-pi)**-3).evaluate(30) == '-0.032251534433199489184422052689'
+
+    with pytest.raises(ValueError):
+        (Real.from_int(-2)**Fraction(1, 2)).evaluate(3)
+
+
+def test_profile() -> None:
+    x = exp(Real(sqrt2_gen()))
+    profile = x.profile(30)
+    labels = [(row.depth, row.label) for row in profile.rows]
+    assert labels[0] == (0, 'ExponentialComputation')
+    assert (1, 'sqrt2_gen') in labels and (1, 'QuadraticComputation') in labels
+
+    root = profile.rows[0]
+    assert root.terms > 0 and root.counters['refinements'] > 0 and root.counters['replays'] > 0
+    assert root.total_seconds >= root.seconds
+    assert profile.total('ingestions') > 0
+    assert 'ExponentialComputation' in str(profile)
+    assert reals._profile.profiler is None
+
+    # terms that were already computed are read from the cache
+    assert x.profile(20).rows == []
+    assert x.evaluate(30) == '4.113250378782927517173581815140'
+
+
+def test_concurrent_consumers() -> None:
+    # switching threads often makes it likely that they interleave while computing terms
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        x = Real(sqrt2_gen()) * exp(Fraction(1, 3)) + e
+        y = Real(sqrt2_gen()) + pi
+        with ThreadPoolExecutor(8) as executor:
+            digits = list(executor.map(lambda _: x.evaluate(200), range(8)))
+            terms = list(executor.map(lambda _: tuple(itertools.islice(y.compute(), 300)), range(8)))
+            floats = list(executor.map(lambda _: y.to_float(), range(8)))
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert len(set(digits)) == 1 and len(set(terms)) == 1 and len(set(floats)) == 1
+    assert digits[0] == x.evaluate(200) and list(y.cache)[:300] == list(terms[0])
+
+
+def test_pickled_plans() -> None:
+    x = sin(pi / 7 + Fraction(1, 3)) * exp(sqrt(2)) - log(3)**2 + Real.sum(iter([e, phi])) + Decimal('0.5')
+    y = pickle.loads(pickle.dumps(x))
+    assert y is not x and y.evaluate(40) == x.evaluate(40)
+
+    # shared subexpressions stay shared, and constants are unpickled as the constants of the process
+    a = sqrt(3)
+    b, c, d = pickle.loads(pickle.dumps([a, a + pi, a]))
+    assert b is d and pickle.loads(pickle.dumps(pi)) is pi
+    c.evaluate(10)
+    assert len(b.cache) > 0
+
+    assert pickle.loads(pickle.dumps(exp(x=Fraction(1, 2)))).evaluate(20) == exp(Fraction(1, 2)).evaluate(20)
+
+    # a plan doesn't keep the reals that it was created from alive
+    f = a + pi
+    ref = weakref.ref(a)
+    del a
+    gc.collect()
+    assert ref() is None and pickle.loads(pickle.dumps(f)).evaluate(20) == f.evaluate(20)
+
+    with pytest.raises(TypeError):
+        pickle.dumps(Real(sqrt2_gen()) + 1)
+
+
+def test_evaluate_many() -> None:
+    xs = [exp(sqrt(2)) - pi, 3, Fraction(1, 7), tan(Real.from_int(2))**Fraction(1, 3)]
+    assert reals.evaluate_many(xs, 30, workers=2) == [Real.from_number(x).evaluate(30) for x in xs]
+    assert reals.evaluate_many([], 30) == []
+
+
+async def first_digits(x: Real, n: int) -> list[str]:
+    digits = []
+    async for digit in x.aiter_digits(max_ingestions=4):
+        digits.append(digit)
+        if len(digits) == n:
+            break
+    return digits
+
+
+def test_async_digits() -> None:
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    async def concurrently() -> list[str]:
+        ticker = asyncio.create_task(tick())
+        digits = await first_digits(exp(sqrt(2)), 31)
+        ticker.cancel()
+        return digits
+
+    assert ''.join(asyncio.run(concurrently())) == '4113250378782927517173581815140'
+    assert ticks >= 5
+    assert ''.join(asyncio.run(first_digits(Real.from_fraction(Fraction(-1, 8)), 10))) == '-0125000000'
+
+    # a cancelled task stops between two terms, which leaves the real in a consistent state
+    x = exp(sqrt(3))
+
+    async def cancel() -> None:
+        task = asyncio.create_task(first_digits(x, 10**6))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel())
+    assert x.evaluate(40) == '5.6522336740340921168666389501514924878485'
+
+    # the task pauses between the terms of every real in the expression, also when a slice allows fewer terms than
+    # the terms are nested deep
+    y = exp(sqrt(2))
+    ticks = 0
+
+    async def sliced() -> list[str]:
+        ticker = asyncio.create_task(tick())
+        digits = []
+        async for digit in y.aiter_digits(max_ingestions=8, max_seconds=60):
+            digits.append(digit)
+            if len(digits) == 101:
+                break
+        ticker.cancel()
+        return digits
+
+    assert ''.join(asyncio.run(sliced())) == y.evaluate(120).replace('.', '')[:101]
+    assert ticks > len(y.cache)
+
+
+def test_budgets() -> None:
+    x = exp(Real(sqrt2_gen()))
+    with pytest.raises(reals.BudgetExceeded) as info:
+        with reals.Budget(max_ingestions=500):
+            x.evaluate(1000)
+    lower, upper = info.value.interval
+    assert lower is not None and upper is not None
+    assert Fraction(4113250378782927517, 10**18) < lower < upper < Fraction(4113250378782927518, 10**18)
+    # the computations continue where they stopped
+    assert x.evaluate(30) == '4.113250378782927517173581815140'
+
+    with pytest.raises(reals.BudgetExceeded) as info:
+        with reals.Budget(max_coefficient_bits=500):
+            exp(sqrt(3)).evaluate(300)
+    assert info.value.resource == 'coefficient bits'
+
+    y = log(Real(sqrt2_gen()))
+    with pytest.raises(reals.BudgetExceeded) as info:
+        with reals.Budget(seconds=0.05):
+            y.evaluate(5000)
+    assert info.value.resource == 'time'
+    assert y.evaluate(20) == '0.34657359027997265471'
+
+    # the interval of a comparison is the interval of the difference
+    with pytest.raises(reals.BudgetExceeded) as info:
+        with reals.Budget(max_ingestions=1000):
+            compare(sqrt(2) * sqrt(3), sqrt(6), Fraction(1, 10**10000))
+    lower, upper = info.value.interval
+    assert lower is not None and upper is not None and lower <= 0 <= upper
+
+    # the coefficients of roots and the other functions of reals are measured as well
+    with pytest.raises(reals.BudgetExceeded) as info:
+        with reals.Budget(max_coefficient_bits=1000):
+            sqrt(e).evaluate(3000)
+    assert info.value.resource == 'coefficient bits'
+
+    # an inner budget doesn't lift the outer one
+    with pytest.raises(reals.BudgetExceeded):
+        with reals.Budget(max_ingestions=10):
+            with reals.Budget(max_ingestions=10**6):
+                (pi * e).evaluate(100)
+
+    budget = reals.Budget(max_ingestions=10**6)
+    with budget:
+        with pytest.raises(RuntimeError):
+            with budget:
+                pass
+    with budget:
+        assert reals._budget.current.get() is budget
+    assert reals._budget.budgets == 0
+
+
 def test_best_rational_approximations() -> None:
     best_rational_approximations(e / pi, 10)
 
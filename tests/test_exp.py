@@ -1,4 +1,5 @@
-from reals import phi, exp
+from reals import phi, exp, sqrt
+from reals._monotone import MonotoneComputation
 
 from fractions import Fraction
 from decimal import Decimal
@@ -33,3 +34,17 @@ def test_exp_real() -> None:
 def test_exp_str() -> None:
     with pytest.raises(TypeError):
         _ = exp('lol').evaluate(100, round=False)  # type: ignore
+
+
+def test_exp_of_reals() -> None:
+    x = exp(sqrt(2))
+    assert x.evaluate(60) == '4.113250378782927517173581815140304502401663943151109610068365'
+    assert isinstance(x.iterator, MonotoneComputation)
+
+
+def test_exp_of_large_arguments() -> None:
+    assert exp(Fraction(10001, 3)).evaluate(0).startswith('62092313013540770656507563225904357981426840')
+    assert exp(Fraction(-1000, 7)).evaluate(80).endswith('907676636045992777')
+    x = exp(sqrt(2) * 100)
+    assert x.evaluate(5) == '26212873830628267217668970472330507966952109517097072360141814.95293'
+    assert exp(0).evaluate(3) == '1.000'
@@ -1,4 +1,5 @@
-from reals import log, pi
+from reals import log, pi, sqrt
+from reals._monotone import MonotoneComputation
 
 from fractions import Fraction
 from decimal import Decimal
@@ -33,3 +34,18 @@ def test_log_real() -> None:
 def test_log_str() -> None:
     with pytest.raises(TypeError):
         _ = log('hello').evaluate(100, round=False)  # type: ignore
+
+
+def test_log_of_reals() -> None:
+    x = log(sqrt(2) + 1)
+    assert x.evaluate(60) == '0.881373587019543025232609324979792309028160328261635410753296'
+    assert isinstance(x.iterator, MonotoneComputation)
+
+
+def test_log_of_rationals() -> None:
+    assert log(Fraction(1, 1000)).evaluate(40) == '-6.9077552789821370520539743640530926228033'
+    assert log(Fraction(3)).evaluate(40) == '1.0986122886681096913952452369225257046475'
+    assert log(Fraction(2**100 + 1, 3**60)).evaluate(30) == '3.397980735907949458008497930467'
+
+    with pytest.raises(ValueError):
+        log(Fraction(0))